@@ -1,8 +1,9 @@
 """
 Interactive Windows conflict scanner and fixer
 - Language selection at start (10 languages)
-- Auto-install psutil if missing (with automatic restart)
-- Choose 1+ report formats from 10 options (.txt, .json, .csv, .xml, .html, .md, .log, .yml, .ini, .pdf)
+- Optional dependencies (psutil, reportlab, PyYAML) checked in one pass and installed in-process,
+  local wheelhouse first, then the package index (no restart)
+- Choose 1+ report formats from 11 options (.txt, .json, .csv, .xml, .html, .md, .log, .yml, .ini, .pdf, .parquet)
 - Localized prompts in chosen language
 """
 
@@ -10,9 +11,27 @@ import subprocess
 import sys
 import platform
 import os
+import argparse
+import base64
+import gzip
+import hmac
+import importlib
+import importlib.util
+import io
 import json
+import mmap
+import secrets
+import signal
+import site
+import struct
+import threading
+import xml.etree.ElementTree as ET
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Tuple, List, Dict, Any
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple, List, Dict, Any, Optional
 
 # ---------------------------
 # Languages (native names)
@@ -38,27 +57,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Выберите язык / Select language:",
         "enter_number": "Введите номер (1-10):",
         "invalid_choice": "Неверный выбор. Попробуйте ещё раз.",
-        "installing_psutil": "Модуль psutil не найден — выполняется автоматическая установка...",
-        "psutil_installed": "psutil установлен. Перезапуск скрипта...",
-        "psutil_failed": "Не удалось установить psutil: {err}",
+        "installing_deps": "Не найдены модули: {mods} — установка (сначала из локального wheelhouse)...",
+        "deps_installed": "Установлено: {mods}",
+        "deps_failed": "Не удалось установить {mods}: {err}",
         "scanning": "Сканирование системы на предмет потенциальных конфликтов...",
         "results_short": "Результаты (кратко):",
         "processes": "Процессы",
-        "startup": "Win32 StartupCommand",
+        "startup": "Автозагрузка",
         "hkcu": "HKCU Run",
         "services": "Службы",
+        "tasks": "Запланированные задачи",
         "interactive_prompt": "Хотите пройти интерактивное разрешение найденных проблем?",
         "yes": "Да",
         "no": "Нет — только отчёт",
         "choose_report_formats": "Выберите форматы отчёта (через запятую, номера):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Генерация отчётов в выбранных форматах...",
         "done": "Готово.",
         "json_file": "JSON файл",
         "txt_file": "Текстовый файл",
         "press_enter": "Нажмите Enter для завершения...",
-        "auto_install_reportlab": "Для создания PDF требуется пакет reportlab — выполняется установка...",
-        "reportlab_failed": "Не удалось установить reportlab: {err}",
         "pdf_created": "PDF создан: {path}",
         "action_prompt": "Действие?",
         "kill": "Завершить",
@@ -68,6 +86,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Удалить",
         "remove_prompt": "Удалить запись?",
         "stop_disable": "Остановить и отключить",
+        "disable_task": "Отключить задачу",
         "skip_label": "Пропустить",
         "failed_save": "Ошибка при сохранении {ext}: {err}"
     },
@@ -75,27 +94,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Choose language / Выбор языка:",
         "enter_number": "Enter number (1-10):",
         "invalid_choice": "Invalid choice. Try again.",
-        "installing_psutil": "psutil not found — installing automatically...",
-        "psutil_installed": "psutil installed. Restarting script...",
-        "psutil_failed": "Failed to install psutil: {err}",
+        "installing_deps": "Missing modules: {mods} — installing (local wheelhouse first)...",
+        "deps_installed": "Installed: {mods}",
+        "deps_failed": "Failed to install {mods}: {err}",
         "scanning": "Scanning system for potential conflicts...",
         "results_short": "Results (short):",
         "processes": "Processes",
-        "startup": "Win32 StartupCommand",
+        "startup": "Startup entries",
         "hkcu": "HKCU Run",
         "services": "Services",
+        "tasks": "Scheduled tasks",
         "interactive_prompt": "Do you want to run interactive remediation?",
         "yes": "Yes",
         "no": "No — report only",
         "choose_report_formats": "Choose report formats (comma-separated indices):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Generating reports in selected formats...",
         "done": "Done.",
         "json_file": "JSON file",
         "txt_file": "Text file",
         "press_enter": "Press Enter to exit...",
-        "auto_install_reportlab": "PDF generation requires reportlab — installing...",
-        "reportlab_failed": "Failed to install reportlab: {err}",
         "pdf_created": "PDF created: {path}",
         "action_prompt": "Action?",
         "kill": "Kill",
@@ -105,6 +123,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Remove",
         "remove_prompt": "Remove entry?",
         "stop_disable": "Stop+Disable",
+        "disable_task": "Disable task",
         "skip_label": "Skip",
         "failed_save": "Failed to save {ext}: {err}"
     },
@@ -112,27 +131,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Seleccione idioma / Select language:",
         "enter_number": "Ingrese número (1-10):",
         "invalid_choice": "Elección inválida. Intente de nuevo.",
-        "installing_psutil": "psutil no encontrado — instalando automáticamente...",
-        "psutil_installed": "psutil instalado. Reiniciando script...",
-        "psutil_failed": "No se pudo instalar psutil: {err}",
+        "installing_deps": "Módulos no encontrados: {mods} — instalando (primero desde el wheelhouse local)...",
+        "deps_installed": "Instalado: {mods}",
+        "deps_failed": "No se pudo instalar {mods}: {err}",
         "scanning": "Escaneando el sistema en busca de conflictos potenciales...",
         "results_short": "Resultados (resumen):",
         "processes": "Procesos",
-        "startup": "Win32 StartupCommand",
+        "startup": "Elementos de inicio",
         "hkcu": "HKCU Run",
         "services": "Servicios",
+        "tasks": "Tareas programadas",
         "interactive_prompt": "¿Desea ejecutar la remediación interactiva?",
         "yes": "Sí",
         "no": "No — sólo informe",
         "choose_report_formats": "Elija formatos de informe (separados por comas, índices):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Generando informes en los formatos seleccionados...",
         "done": "Hecho.",
         "json_file": "Archivo JSON",
         "txt_file": "Archivo de texto",
         "press_enter": "Presione Enter para salir...",
-        "auto_install_reportlab": "Para generar PDF se necesita reportlab — instalando...",
-        "reportlab_failed": "No se pudo instalar reportlab: {err}",
         "pdf_created": "PDF creado: {path}",
         "action_prompt": "Acción?",
         "kill": "Finalizar",
@@ -142,6 +160,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Eliminar",
         "remove_prompt": "¿Eliminar entrada?",
         "stop_disable": "Detener+Deshabilitar",
+        "disable_task": "Deshabilitar tarea",
         "skip_label": "Omitir",
         "failed_save": "Error al guardar {ext}: {err}"
     },
@@ -149,27 +168,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Escolha o idioma / Select language:",
         "enter_number": "Digite o número (1-10):",
         "invalid_choice": "Escolha inválida. Tente novamente.",
-        "installing_psutil": "psutil não encontrado — instalando automaticamente...",
-        "psutil_installed": "psutil instalado. Reiniciando o script...",
-        "psutil_failed": "Falha ao instalar psutil: {err}",
+        "installing_deps": "Módulos ausentes: {mods} — instalando (primeiro do wheelhouse local)...",
+        "deps_installed": "Instalado: {mods}",
+        "deps_failed": "Falha ao instalar {mods}: {err}",
         "scanning": "Verificando o sistema em busca de possíveis conflitos...",
         "results_short": "Resultados (resumo):",
         "processes": "Processos",
-        "startup": "Win32 StartupCommand",
+        "startup": "Itens de inicialização",
         "hkcu": "HKCU Run",
         "services": "Serviços",
+        "tasks": "Tarefas agendadas",
         "interactive_prompt": "Deseja executar a correção interativa?",
         "yes": "Sim",
         "no": "Não — apenas relatório",
         "choose_report_formats": "Escolha formatos de relatório (separados por vírgula, índices):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Gerando relatórios nos formatos selecionados...",
         "done": "Concluído.",
         "json_file": "Arquivo JSON",
         "txt_file": "Arquivo de texto",
         "press_enter": "Pressione Enter para sair...",
-        "auto_install_reportlab": "Para gerar PDF é necessário reportlab — instalando...",
-        "reportlab_failed": "Falha ao instalar reportlab: {err}",
         "pdf_created": "PDF criado: {path}",
         "action_prompt": "Ação?",
         "kill": "Finalizar",
@@ -179,6 +197,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Remover",
         "remove_prompt": "Remover entrada?",
         "stop_disable": "Parar+Desabilitar",
+        "disable_task": "Desativar tarefa",
         "skip_label": "Pular",
         "failed_save": "Falha ao salvar {ext}: {err}"
     },
@@ -186,27 +205,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Dil seçin / Select language:",
         "enter_number": "Sayı girin (1-10):",
         "invalid_choice": "Geçersiz seçim. Tekrar deneyin.",
-        "installing_psutil": "psutil bulunamadı — otomatik yükleme yapılıyor...",
-        "psutil_installed": "psutil yüklendi. Betik yeniden başlatılıyor...",
-        "psutil_failed": "psutil yüklenemedi: {err}",
+        "installing_deps": "Eksik modüller: {mods} — yükleniyor (önce yerel wheelhouse)...",
+        "deps_installed": "Yüklendi: {mods}",
+        "deps_failed": "{mods} yüklenemedi: {err}",
         "scanning": "Olası çakışmalar için sistem taranıyor...",
         "results_short": "Sonuçlar (kısa):",
         "processes": "İşlemler",
-        "startup": "Win32 StartupCommand",
+        "startup": "Başlangıç öğeleri",
         "hkcu": "HKCU Run",
         "services": "Hizmetler",
+        "tasks": "Zamanlanmış görevler",
         "interactive_prompt": "Etkileşimli düzeltme yapmak istiyor musunuz?",
         "yes": "Evet",
         "no": "Hayır — sadece rapor",
         "choose_report_formats": "Rapor formatlarını seçin (virgülle ayırın, numaralar):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Seçilen formatlarda raporlar oluşturuluyor...",
         "done": "Tamamlandı.",
         "json_file": "JSON dosyası",
         "txt_file": "Metin dosyası",
         "press_enter": "Çıkmak için Enter'a basın...",
-        "auto_install_reportlab": "PDF oluşturmak için reportlab gerekiyor — yükleniyor...",
-        "reportlab_failed": "reportlab yüklenemedi: {err}",
         "pdf_created": "PDF oluşturuldu: {path}",
         "action_prompt": "Eylem?",
         "kill": "Durdur",
@@ -216,6 +234,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Kaldır",
         "remove_prompt": "Girdiyi kaldır?",
         "stop_disable": "Durdur+Devre Dışı Bırak",
+        "disable_task": "Görevi devre dışı bırak",
         "skip_label": "Atla",
         "failed_save": "{ext} kaydedilemedi: {err}"
     },
@@ -223,27 +242,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Sprache wählen / Select language:",
         "enter_number": "Geben Sie eine Zahl ein (1-10):",
         "invalid_choice": "Ungültige Auswahl. Versuchen Sie es erneut.",
-        "installing_psutil": "psutil nicht gefunden — Installation wird automatisch durchgeführt...",
-        "psutil_installed": "psutil installiert. Skript wird neu gestartet...",
-        "psutil_failed": "Installation von psutil fehlgeschlagen: {err}",
+        "installing_deps": "Fehlende Module: {mods} — Installation (zuerst aus dem lokalen Wheelhouse)...",
+        "deps_installed": "Installiert: {mods}",
+        "deps_failed": "Installation von {mods} fehlgeschlagen: {err}",
         "scanning": "System wird auf mögliche Konflikte überprüft...",
         "results_short": "Ergebnisse (kurz):",
         "processes": "Prozesse",
-        "startup": "Win32 StartupCommand",
+        "startup": "Autostart-Einträge",
         "hkcu": "HKCU Run",
         "services": "Dienste",
+        "tasks": "Geplante Aufgaben",
         "interactive_prompt": "Möchten Sie die interaktive Behebung starten?",
         "yes": "Ja",
         "no": "Nein — nur Bericht",
         "choose_report_formats": "Wählen Sie Berichtformate (durch Komma, Indizes):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Erzeuge Berichte in den ausgewählten Formaten...",
         "done": "Fertig.",
         "json_file": "JSON-Datei",
         "txt_file": "Textdatei",
         "press_enter": "Drücken Sie Enter zum Beenden...",
-        "auto_install_reportlab": "Reportlab wird für PDF benötigt — Installation läuft...",
-        "reportlab_failed": "Reportlab-Installation fehlgeschlagen: {err}",
         "pdf_created": "PDF erstellt: {path}",
         "action_prompt": "Aktion?",
         "kill": "Beenden",
@@ -253,6 +271,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Entfernen",
         "remove_prompt": "Eintrag entfernen?",
         "stop_disable": "Stoppen+Deaktivieren",
+        "disable_task": "Aufgabe deaktivieren",
         "skip_label": "Überspringen",
         "failed_save": "Speichern von {ext} fehlgeschlagen: {err}"
     },
@@ -260,27 +279,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Choisir la langue / Select language:",
         "enter_number": "Entrez le numéro (1-10):",
         "invalid_choice": "Choix invalide. Réessayez.",
-        "installing_psutil": "psutil introuvable — installation automatique...",
-        "psutil_installed": "psutil installé. Redémarrage du script...",
-        "psutil_failed": "Échec de l'installation de psutil: {err}",
+        "installing_deps": "Modules manquants : {mods} — installation (wheelhouse local en priorité)...",
+        "deps_installed": "Installé : {mods}",
+        "deps_failed": "Échec de l'installation de {mods} : {err}",
         "scanning": "Analyse du système pour conflits potentiels...",
         "results_short": "Résultats (résumé):",
         "processes": "Processus",
-        "startup": "Win32 StartupCommand",
+        "startup": "Éléments de démarrage",
         "hkcu": "HKCU Run",
         "services": "Services",
+        "tasks": "Tâches planifiées",
         "interactive_prompt": "Voulez-vous exécuter la correction interactive?",
         "yes": "Oui",
         "no": "Non — uniquement le rapport",
         "choose_report_formats": "Choisissez les formats de rapport (séparés par des virgules, indices):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Génération des rapports dans les formats sélectionnés...",
         "done": "Terminé.",
         "json_file": "Fichier JSON",
         "txt_file": "Fichier texte",
         "press_enter": "Appuyez sur Entrée pour quitter...",
-        "auto_install_reportlab": "La génération PDF nécessite reportlab — installation...",
-        "reportlab_failed": "Échec de l'installation de reportlab: {err}",
         "pdf_created": "PDF créé: {path}",
         "action_prompt": "Action?",
         "kill": "Terminer",
@@ -290,6 +308,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Supprimer",
         "remove_prompt": "Supprimer l'entrée?",
         "stop_disable": "Arrêter+Désactiver",
+        "disable_task": "Désactiver la tâche",
         "skip_label": "Ignorer",
         "failed_save": "Échec de sauvegarde {ext}: {err}"
     },
@@ -297,27 +316,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "Scegli la lingua / Select language:",
         "enter_number": "Inserisci numero (1-10):",
         "invalid_choice": "Scelta non valida. Riprova.",
-        "installing_psutil": "psutil non trovato — installazione automatica in corso...",
-        "psutil_installed": "psutil installato. Riavvio dello script...",
-        "psutil_failed": "Installazione di psutil fallita: {err}",
+        "installing_deps": "Moduli mancanti: {mods} — installazione (prima dal wheelhouse locale)...",
+        "deps_installed": "Installato: {mods}",
+        "deps_failed": "Installazione di {mods} fallita: {err}",
         "scanning": "Scansione del sistema per possibili conflitti...",
         "results_short": "Risultati (breve):",
         "processes": "Processi",
-        "startup": "Win32 StartupCommand",
+        "startup": "Elementi di avvio",
         "hkcu": "HKCU Run",
         "services": "Servizi",
+        "tasks": "Attività pianificate",
         "interactive_prompt": "Vuoi eseguire la risoluzione interattiva?",
         "yes": "Sì",
         "no": "No — solo rapporto",
         "choose_report_formats": "Scegli i formati del rapporto (separati da virgola, indici):",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "Generazione rapporti nei formati scelti...",
         "done": "Fatto.",
         "json_file": "File JSON",
         "txt_file": "File di testo",
         "press_enter": "Premi Invio per uscire...",
-        "auto_install_reportlab": "Per creare PDF è richiesto reportlab — installazione...",
-        "reportlab_failed": "Installazione reportlab fallita: {err}",
         "pdf_created": "PDF creato: {path}",
         "action_prompt": "Azione?",
         "kill": "Chiudi",
@@ -327,6 +345,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "Rimuovi",
         "remove_prompt": "Rimuovere la voce?",
         "stop_disable": "Arresta+Disabilita",
+        "disable_task": "Disattiva attività",
         "skip_label": "Salta",
         "failed_save": "Salvataggio {ext} fallito: {err}"
     },
@@ -334,27 +353,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "选择语言 / Select language:",
         "enter_number": "请输入数字 (1-10):",
         "invalid_choice": "选择无效。请重试。",
-        "installing_psutil": "未找到 psutil — 正在自动安装...",
-        "psutil_installed": "psutil 已安装。正在重启脚本...",
-        "psutil_failed": "安装 psutil 失败: {err}",
+        "installing_deps": "缺少模块: {mods} — 正在安装(优先使用本地 wheelhouse)...",
+        "deps_installed": "已安装: {mods}",
+        "deps_failed": "安装 {mods} 失败: {err}",
         "scanning": "正在扫描系统以查找潜在冲突...",
         "results_short": "结果（简要）:",
         "processes": "进程",
-        "startup": "Win32 启动命令",
+        "startup": "启动项",
         "hkcu": "HKCU Run",
         "services": "服务",
+        "tasks": "计划任务",
         "interactive_prompt": "是否运行交互式修复？",
         "yes": "是",
         "no": "否 — 仅报告",
         "choose_report_formats": "选择报告格式（用逗号分隔，编号）:",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "正在以所选格式生成报告...",
         "done": "完成。",
         "json_file": "JSON 文件",
         "txt_file": "文本文件",
         "press_enter": "按 Enter 退出...",
-        "auto_install_reportlab": "生成 PDF 需要 reportlab — 正在安装...",
-        "reportlab_failed": "安装 reportlab 失败: {err}",
         "pdf_created": "PDF 已创建: {path}",
         "action_prompt": "操作?",
         "kill": "终止",
@@ -364,6 +382,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "删除",
         "remove_prompt": "删除条目？",
         "stop_disable": "停止并禁用",
+        "disable_task": "禁用任务",
         "skip_label": "跳过",
         "failed_save": "保存 {ext} 失败: {err}"
     },
@@ -371,27 +390,26 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "choose_lang_header": "言語を選択 / Select language:",
         "enter_number": "番号を入力してください (1-10):",
         "invalid_choice": "無効な選択です。もう一度お試しください。",
-        "installing_psutil": "psutil が見つかりません — 自動インストール中...",
-        "psutil_installed": "psutil がインストールされました。スクリプトを再起動します...",
-        "psutil_failed": "psutil のインストールに失敗しました: {err}",
+        "installing_deps": "不足しているモジュール: {mods} — インストール中 (ローカル wheelhouse を優先)...",
+        "deps_installed": "インストール済み: {mods}",
+        "deps_failed": "{mods} のインストールに失敗しました: {err}",
         "scanning": "潜在的な競合を検出するためにシステムをスキャンしています...",
         "results_short": "結果（簡易）:",
         "processes": "プロセス",
-        "startup": "Win32 StartupCommand",
+        "startup": "スタートアップ項目",
         "hkcu": "HKCU Run",
         "services": "サービス",
+        "tasks": "スケジュールされたタスク",
         "interactive_prompt": "対話型の修復を実行しますか？",
         "yes": "はい",
         "no": "いいえ — レポートのみ",
         "choose_report_formats": "レポート形式を選択（カンマ区切り、番号）：",
-        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf",
+        "formats_list": "1:.txt 2:.json 3:.csv 4:.xml 5:.html 6:.md 7:.log 8:.yml 9:.ini 10:.pdf 11:.parquet",
         "generating_reports": "選択した形式でレポートを生成しています...",
         "done": "完了。",
         "json_file": "JSON ファイル",
         "txt_file": "テキストファイル",
         "press_enter": "終了するには Enter キーを押してください...",
-        "auto_install_reportlab": "PDF 作成には reportlab が必要です — インストール中...",
-        "reportlab_failed": "reportlab のインストールに失敗しました: {err}",
         "pdf_created": "PDF 作成済み: {path}",
         "action_prompt": "操作?",
         "kill": "終了",
@@ -401,6 +419,7 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "remove": "削除",
         "remove_prompt": "エントリを削除しますか？",
         "stop_disable": "停止＋無効化",
+        "disable_task": "タスクを無効化",
         "skip_label": "スキップ",
         "failed_save": "{ext} の保存に失敗しました: {err}"
     }
@@ -427,7 +446,15 @@ def choose_language() -> str:
         print("Invalid choice. Try again.")
 
 # Temporary set language selection
-SELECTED_LANG = choose_language()
+def preselected_language() -> Optional[str]:
+    # headless runs (agent mode, ERRORBROKER_LANG) skip the interactive prompt
+    if os.environ.get("ERRORBROKER_LANG"):
+        return os.environ["ERRORBROKER_LANG"]
+    if "--agent" in sys.argv[1:]:
+        return "en"
+    return None
+
+SELECTED_LANG = preselected_language() or choose_language()
 if SELECTED_LANG not in TRANSLATIONS:
     SELECTED_LANG = "en"
 
@@ -435,36 +462,373 @@ def t(key: str) -> str:
     return TRANSLATIONS.get(SELECTED_LANG, TRANSLATIONS["en"]).get(key, TRANSLATIONS["en"].get(key, key))
 
 # ---------------------------
-# Auto-install psutil (with restart)
+# Dependency bootstrap (local wheelhouse first, no restart)
 # ---------------------------
-def ensure_psutil():
-    try:
-        import psutil  # type: ignore
-        return True
-    except ImportError:
-        print(t("installing_psutil"))
+# import name -> distribution name on the index
+OPTIONAL_DEPENDENCIES: Dict[str, str] = {
+    "psutil": "psutil",
+    "reportlab": "reportlab",
+    "yaml": "PyYAML"
+}
+# wheels shipped next to the script are tried before any network index
+WHEELHOUSE_DIR = os.environ.get("ERRORBROKER_WHEELHOUSE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "wheelhouse")
+# index used when the wheelhouse lacks a package; "off" keeps installs strictly offline
+DEPENDENCY_INDEX_URL = os.environ.get("ERRORBROKER_INDEX_URL", "")
+# one deadline over the whole bootstrap, every pip call included; a slow index cannot stall startup past it
+BOOTSTRAP_TIMEOUT_SECONDS = 120
+
+def missing_dependencies(modules: Optional[List[str]] = None) -> List[str]:
+    # find_spec only locates the module, so checking is cheap even for reportlab
+    missing = []
+    for module in modules if modules is not None else list(OPTIONAL_DEPENDENCIES):
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "psutil"])
-            print(t("psutil_installed"))
-            # Restart with same args
-            subprocess.Popen([sys.executable] + sys.argv)
-            sys.exit(0)
-        except Exception as e:
-            print(t("psutil_failed").format(err=str(e)))
-            return False
+            found = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            missing.append(module)
+    return missing
+
+def _pip_install(packages: List[str], source_args: List[str], timeout: float) -> Tuple[int, str]:
+    cmd = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check", "-q", *source_args, *packages]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return 1, str(e)
+    return proc.returncode, (proc.stderr or proc.stdout).strip()
+
+def _activate_installed() -> None:
+    # a fresh install may have created a site dir that did not exist at startup
+    for site_dir in [*getattr(site, "getsitepackages", lambda: [])(), site.getusersitepackages()]:
+        if os.path.isdir(site_dir) and site_dir not in sys.path:
+            site.addsitedir(site_dir)
+    importlib.invalidate_caches()
+
+def install_dependencies(modules: List[str], timeout: float = BOOTSTRAP_TIMEOUT_SECONDS) -> Dict[str, Optional[str]]:
+    # module -> None when importable afterwards, else the last pip error
+    deadline = time.monotonic() + timeout
+    errors: Dict[str, Optional[str]] = {}
+    pending = list(modules)
+    sources = []  # (pip source args, is the local wheelhouse)
+    if os.path.isdir(WHEELHOUSE_DIR):
+        sources.append((["--no-index", "--find-links", WHEELHOUSE_DIR], True))
+    if DEPENDENCY_INDEX_URL.lower() != "off":
+        sources.append((["--index-url", DEPENDENCY_INDEX_URL] if DEPENDENCY_INDEX_URL else [], False))
+    if not sources:
+        return {module: f"no wheelhouse at {WHEELHOUSE_DIR} and index disabled" for module in modules}
+    for source_args, local in sources:
+        if not pending:
+            break
+        if deadline - time.monotonic() <= 0:
+            errors.update((module, f"dependency bootstrap exceeded {timeout:g}s") for module in pending)
+            break
+        rc, err = _pip_install([OPTIONAL_DEPENDENCIES.get(m, m) for m in pending], source_args,
+                               deadline - time.monotonic())
+        if rc != 0 and local and len(pending) > 1:
+            # pip is all-or-nothing per call; retry one by one so one missing wheel does not block the rest.
+            # Only the wheelhouse is retried: it fails fast, whereas each index retry could hang on the network
+            for module in pending:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    errors[module] = f"dependency bootstrap exceeded {timeout:g}s"
+                    continue
+                _, errors[module] = _pip_install([OPTIONAL_DEPENDENCIES.get(module, module)], source_args, left)
+        else:
+            errors.update((module, err) for module in pending)
+        _activate_installed()
+        pending = missing_dependencies(pending)
+    return {module: (errors.get(module) or "not importable after install") if module in pending else None
+            for module in modules}
+
+def bootstrap_dependencies(modules: Optional[List[str]] = None) -> Dict[str, bool]:
+    # one pass over every optional dependency: check, install what is missing, continue in-process
+    modules = modules if modules is not None else list(OPTIONAL_DEPENDENCIES)
+    missing = missing_dependencies(modules)
+    if missing:
+        print(t("installing_deps").format(mods=", ".join(missing)))
+        results = install_dependencies(missing)
+        installed = [m for m, err in results.items() if err is None]
+        failed = {m: err for m, err in results.items() if err is not None}
+        if installed:
+            print(t("deps_installed").format(mods=", ".join(installed)))
+        for module, err in failed.items():
+            print(t("deps_failed").format(mods=module, err=err.splitlines()[-1] if err else ""))
+        missing = list(failed)
+    return {module: module not in missing for module in modules}
+
+# ---------------------------
+# Record / replay of scan inputs
+# ---------------------------
+CAPTURE_VERSION = 1
+
+class ScanCapture:
+    # everything the live scanners read from the machine, so a scan can be reproduced anywhere
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.system: Dict[str, Any] = data.get("system") or {}
+        self.powershell: List[Dict[str, Any]] = data.get("powershell") or []
+        self.processes: List[Dict[str, Any]] = data.get("processes") or []
+        self.process_details: Dict[str, Dict[str, Any]] = data.get("process_details") or {}
+        self.pe_versions: Dict[str, Dict[str, Any]] = data.get("pe_versions") or {}
+        self.listings: Dict[str, List[str]] = data.get("listings") or {}
+        self.trees: Dict[str, List[str]] = data.get("trees") or {}
+        self.files: Dict[str, str] = data.get("files") or {}
+        self.paths: Dict[str, str] = data.get("paths") or {}
+        self.registry: Dict[str, Dict[str, Any]] = data.get("registry") or {}
+        # the process table could not be read at all on the recording machine
+        self.psutil_missing: bool = bool(data.get("psutil_missing"))
+        self._lock = threading.Lock()
+        self._replies: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in self.powershell:
+            self._replies.setdefault(entry["cmd"], []).append(entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": CAPTURE_VERSION,
+                "recorded_at": datetime.now().isoformat(),
+                "system": self.system,
+                "powershell": list(self.powershell),
+                "processes": list(self.processes),
+                "process_details": dict(self.process_details),
+                "pe_versions": dict(self.pe_versions),
+                "listings": dict(self.listings),
+                "trees": dict(self.trees),
+                "files": dict(self.files),
+                "paths": dict(self.paths),
+                "registry": dict(self.registry),
+                "psutil_missing": self.psutil_missing
+            }
+
+    def add_powershell(self, cmd: str, out: str, err: str, rc: int) -> None:
+        with self._lock:
+            self.powershell.append({"cmd": cmd, "stdout": out, "stderr": err, "rc": rc})
+
+    def next_powershell(self, cmd: str) -> Tuple[str, str, int]:
+        with self._lock:
+            replies = self._replies.get(cmd)
+            if not replies:
+                return "", "replay: command not in capture", 1
+            # replies are consumed in recorded order; the last one keeps answering repeats
+            entry = replies.pop(0) if len(replies) > 1 else replies[0]
+        return entry["stdout"], entry["stderr"], entry["rc"]
+
+    def add_process(self, info: Dict[str, Any]) -> None:
+        with self._lock:
+            self.processes.append({"pid": info.get("pid"), "name": info.get("name"), "exe": info.get("exe")})
+
+    def add_file(self, path: str, data: bytes) -> None:
+        with self._lock:
+            self.files[path] = base64.b64encode(data).decode("ascii")
+
+    def read_file(self, path: str) -> bytes:
+        encoded = self.files.get(path)
+        if encoded is None:
+            raise FileNotFoundError(path)
+        return base64.b64decode(encoded)
+
+RECORDING: Optional[ScanCapture] = None
+REPLAYING: Optional[ScanCapture] = None
+
+def start_recording() -> ScanCapture:
+    global RECORDING
+    RECORDING = ScanCapture()
+    RECORDING.system = current_system_info()
+    return RECORDING
+
+def start_replay(capture: ScanCapture) -> ScanCapture:
+    global REPLAYING
+    REPLAYING = capture
+    return capture
+
+def stop_capture() -> None:
+    global RECORDING, REPLAYING
+    RECORDING = None
+    REPLAYING = None
+
+def save_capture(capture: ScanCapture, path: str) -> str:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(capture.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+    return path
+
+def load_capture(path: str) -> ScanCapture:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CAPTURE_VERSION:
+        raise ValueError(f"unsupported capture version {data.get('version')!r}")
+    return ScanCapture(data)
+
+def current_system_info() -> Dict[str, Any]:
+    if REPLAYING is not None:
+        return dict(REPLAYING.system)
+    return {
+        "host": platform.node(),
+        "os": platform.system(),
+        "release": platform.release(),
+        "platform": platform.platform()
+    }
+
+def expand_path(path: str) -> str:
+    # %VAR% expansion happens on the recording machine; replay reuses its result
+    if REPLAYING is not None:
+        return REPLAYING.paths.get(path, path)
+    expanded = os.path.expandvars(path)
+    if RECORDING is not None:
+        RECORDING.paths[path] = expanded
+    return expanded
+
+def read_file_bytes(path: str) -> bytes:
+    if REPLAYING is not None:
+        return REPLAYING.read_file(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if RECORDING is not None:
+        RECORDING.add_file(path, data)
+    return data
+
+def read_registry_values(key: str) -> Dict[str, Any]:
+    # values of one live key such as r"HKLM\SOFTWARE\..."; raises OSError when it is missing
+    if REPLAYING is not None:
+        if key not in REPLAYING.registry:
+            raise FileNotFoundError(key)
+        return dict(REPLAYING.registry[key])
+    import winreg  # type: ignore
+    roots = {"HKLM": winreg.HKEY_LOCAL_MACHINE, "HKU": winreg.HKEY_USERS, "HKCU": winreg.HKEY_CURRENT_USER}
+    hive, _, subkey = key.partition("\\")
+    values: Dict[str, Any] = {}
+    with winreg.OpenKey(roots[hive], subkey) as k:
+        for i in range(winreg.QueryInfoKey(k)[1]):
+            name, data, _ = winreg.EnumValue(k, i)
+            values[name] = data if isinstance(data, (str, int)) else str(data)
+    if RECORDING is not None:
+        RECORDING.registry[key] = values
+    return values
+
+def list_folder_files(folder: str) -> List[str]:
+    # files directly inside folder; raises OSError when the folder is missing
+    if REPLAYING is not None:
+        if folder not in REPLAYING.listings:
+            raise FileNotFoundError(folder)
+        return list(REPLAYING.listings[folder])
+    with os.scandir(folder) as it:
+        paths = [e.path for e in it if e.is_file()]
+    if RECORDING is not None:
+        RECORDING.listings[folder] = paths
+    return paths
+
+def walk_folder_files(root: str, errors: Optional[List[str]] = None) -> List[str]:
+    # raises OSError when root itself cannot be listed; unreadable subfolders go to errors
+    if REPLAYING is not None:
+        if root not in REPLAYING.trees:
+            raise FileNotFoundError(root)
+        return list(REPLAYING.trees[root])
+    with os.scandir(root):
+        pass
+    paths = []
+
+    def skipped(e: OSError) -> None:
+        if errors is not None:
+            errors.append(f"{e.filename}: {e.strerror or e}")
+
+    for dirpath, _, filenames in os.walk(root, onerror=skipped):
+        paths.extend(os.path.join(dirpath, fn) for fn in filenames)
+    if RECORDING is not None:
+        RECORDING.trees[root] = paths
+    return paths
+
+def path_is_file(path: str) -> bool:
+    if REPLAYING is not None:
+        return path in REPLAYING.pe_versions
+    return os.path.isfile(path)
+
+def split_any_path(path: str) -> Tuple[str, str]:
+    # dirname/basename for both Windows and POSIX separators (captures are replayed across OSes)
+    cut = max(path.rfind("\\"), path.rfind("/"))
+    return path[:cut], path[cut + 1:]
+
+def replay_dry_run(what: str) -> Dict[str, Any]:
+    return {"ok": False, "message": f"replay: {what} not executed"}
 
 # ---------------------------
 # PowerShell utility
 # ---------------------------
-def powershell_exec(cmd: str) -> Tuple[str, str, int]:
+# Return code reported by powershell_exec when the command hit its timeout
+PS_TIMEOUT_RC = 124
+# How long to wait for pipes to drain after a timed-out child was killed.
+# Taken out of the caller's timeout (at most a quarter of it), never added on top.
+PS_KILL_GRACE_SECONDS = 2.0
+
+def _kill_process_tree(p: subprocess.Popen, timeout: float = PS_KILL_GRACE_SECONDS) -> None:
+    try:
+        import psutil  # type: ignore
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            for child in psutil.Process(p.pid).children(recursive=True):
+                try:
+                    child.kill()
+                except Exception:
+                    pass
+        except Exception:
+            pass
+    elif os.name == "nt":
+        # no psutil: taskkill walks the tree itself
+        try:
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(p.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=max(timeout, 0.1))
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+    if os.name != "nt":
+        # the child leads its own session (start_new_session), so its group is the whole tree
+        try:
+            os.killpg(p.pid, signal.SIGKILL)
+        except OSError:
+            pass
     try:
-        p = subprocess.run(
+        p.kill()
+    except Exception:
+        pass
+
+def _as_text(data: Any) -> str:
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return data or ""
+
+def powershell_exec(cmd: str, timeout: Optional[float] = None) -> Tuple[str, str, int]:
+    if REPLAYING is not None:
+        return REPLAYING.next_powershell(cmd)
+    out, err, rc = _powershell_run(cmd, timeout)
+    if RECORDING is not None:
+        RECORDING.add_powershell(cmd, out, err, rc)
+    return out, err, rc
+
+def _powershell_run(cmd: str, timeout: Optional[float]) -> Tuple[str, str, int]:
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    grace = min(PS_KILL_GRACE_SECONDS, timeout / 4) if timeout is not None else PS_KILL_GRACE_SECONDS
+    try:
+        p = subprocess.Popen(
             ['powershell', '-NoProfile', '-ExecutionPolicy', 'Bypass', '-Command', cmd],
-            capture_output=True, text=True
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, start_new_session=os.name != "nt"
         )
-        return (p.stdout or "").strip(), (p.stderr or "").strip(), p.returncode
     except Exception as e:
         return "", str(e), 1
+    try:
+        out, err = p.communicate(timeout=max(0.0, timeout - grace) if timeout is not None else None)
+        return (out or "").strip(), (err or "").strip(), p.returncode
+    except subprocess.TimeoutExpired:
+        # kill the child (and anything it spawned), then keep whatever output already arrived
+        _kill_process_tree(p, grace)
+        try:
+            left = deadline - time.monotonic() if deadline is not None else grace
+            out, err = p.communicate(timeout=max(0.01, left))
+        except subprocess.TimeoutExpired as e:
+            out, err = _as_text(e.stdout), _as_text(e.stderr)
+        return (out or "").strip(), (err or "").strip(), PS_TIMEOUT_RC
+    except Exception as e:
+        _kill_process_tree(p)
+        return "", str(e), 1
 
 # ---------------------------
 # Config & scanners (same logic as before)
@@ -479,43 +843,399 @@ EDGE_LOCATIONS = [
     r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"
 ]
 
+# Overall wall-clock budget for one full scan, in seconds
+SCAN_BUDGET_SECONDS = float(os.environ.get("ERRORBROKER_SCAN_BUDGET", "120"))
+# Per-scanner timeouts, in seconds (clamped to whatever is left of the overall budget)
+SCANNER_TIMEOUTS: Dict[str, float] = {
+    "process_conflicts": 30.0,
+    "startup_conflicts": 45.0,
+    "hkcu_conflicts": 20.0,
+    "service_conflicts": 45.0,
+    "scheduled_task_conflicts": 20.0
+}
+
+# ---------------------------
+# Finding / Action records
+# ---------------------------
+# JSON key -> attribute, per section; defines the report shape of every finding
+FINDING_FIELDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "process_conflicts": (("name", "name"), ("pid", "pid"), ("path", "path")),
+    "startup_conflicts": (("name", "name"), ("command", "command")),
+    "hkcu_conflicts": (("name", "name"), ("value", "command")),
+    "service_conflicts": (("name", "name"), ("display_name", "display_name"), ("state", "state"), ("path", "path")),
+    "scheduled_task_conflicts": (("name", "name"), ("command", "command"), ("state", "state"), ("path", "path"))
+}
+# optional origin of a finding (Startup folder, offline user profile), omitted when unset
+FINDING_SOURCE_KEY = {"startup_conflicts": "source", "hkcu_conflicts": "user"}
+
+def _intern(s: Optional[str]) -> Optional[str]:
+    return sys.intern(s) if s else s
+
+class Finding:
+    # one row per detected item; repeated strings are interned so a fleet-sized list stays small
+    __slots__ = ("section", "name", "pid", "path", "command", "display_name", "state", "source", "extra", "raw")
+
+    def __init__(self, section: str, name: Optional[str] = None, pid: Optional[int] = None,
+                 path: Optional[str] = None, command: Optional[str] = None, display_name: Optional[str] = None,
+                 state: Optional[str] = None, source: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None, raw: Any = None):
+        self.section = sys.intern(section)
+        self.name = _intern(name)
+        self.pid = pid
+        self.path = path
+        self.command = command
+        self.display_name = display_name
+        self.state = _intern(state)
+        self.source = _intern(source)
+        self.extra = extra
+        # raw: plain-text fallback line (or error dict) emitted verbatim
+        self.raw = raw
+
+    @property
+    def error(self) -> Optional[str]:
+        if isinstance(self.raw, dict):
+            return self.raw.get("error")
+        return self.extra.get("error") if self.extra else None
+
+    def is_actionable(self) -> bool:
+        return self.raw is None and not self.error
+
+    def set_extra(self, key: str, value: Any) -> None:
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def to_dict(self) -> Any:
+        if self.raw is not None:
+            return self.raw
+        d = {key: getattr(self, attr) for key, attr in FINDING_FIELDS[self.section]}
+        if self.source is not None and self.section in FINDING_SOURCE_KEY:
+            d[FINDING_SOURCE_KEY[self.section]] = self.source
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+class Action:
+    __slots__ = ("action", "target", "result")
+
+    def __init__(self, action: str, target: Any, result: Any = None):
+        self.action = sys.intern(action)
+        self.target = target
+        self.result = result
+
+    def to_dict(self) -> Dict[str, Any]:
+        target = self.target.to_dict() if isinstance(self.target, Finding) else self.target
+        d = {"action": self.action, "target": target}
+        if self.result is not None:
+            d["result"] = self.result
+        return d
+
+def to_jsonable(obj: Any) -> Any:
+    # json.dump(default=...) hook: records serialize straight to their report shape
+    if isinstance(obj, (Finding, Action)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def to_plain(obj: Any) -> Any:
+    # deep conversion for writers without a serialization hook (yaml)
+    if isinstance(obj, (Finding, Action)):
+        obj = obj.to_dict()
+    if isinstance(obj, dict):
+        return {k: to_plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_plain(v) for v in obj]
+    return obj
+
+def match_lines(out: str, section: str) -> List[Finding]:
+    return [Finding(section, raw=ln.strip()) for ln in out.splitlines() if any(term in ln.lower() for term in SEARCH_TERMS)]
+
+def timeout_result(items: List[Any], details: str = "") -> Dict[str, Any]:
+    return {"error": "timeout", "partial": True, "details": details, "items": items}
+
+def is_partial(val: Any) -> bool:
+    return isinstance(val, dict) and bool(val.get("partial"))
+
+def section_items(val: Any, actionable: bool = False) -> List[Any]:
+    # findings of a section: the list itself, or the items salvaged by a timed-out scanner
+    if isinstance(val, (list, tuple)):
+        items = list(val)
+    elif is_partial(val):
+        items = list(val.get("items") or [])
+    else:
+        items = []
+    if actionable:
+        return [it for it in items if isinstance(it, Finding) and it.is_actionable()]
+    return items
+
+# ---------------------------
+# PE version resources (no subprocess)
+# ---------------------------
+RT_VERSION = 16
+VS_FIXEDFILEINFO_SIGNATURE = 0xFEEF04BD
+
+def _pe_rva_to_offset(sections: List[Tuple[int, int, int, int]], rva: int) -> int:
+    for vaddr, vsize, raw_ptr, raw_size in sections:
+        if vaddr <= rva < vaddr + max(vsize, raw_size):
+            return raw_ptr + (rva - vaddr)
+    raise ValueError(f"RVA 0x{rva:x} is outside every section")
+
+def _pe_version_resource(buf: Any) -> Optional[Tuple[int, int]]:
+    if buf[0:2] != b"MZ":
+        raise ValueError("not a PE file (missing MZ header)")
+    pe = struct.unpack_from("<I", buf, 0x3C)[0]
+    if buf[pe:pe + 4] != b"PE\0\0":
+        raise ValueError("not a PE file (missing PE signature)")
+    nsections, = struct.unpack_from("<H", buf, pe + 6)
+    opt_size, = struct.unpack_from("<H", buf, pe + 20)
+    opt = pe + 24
+    magic, = struct.unpack_from("<H", buf, opt)
+    if magic == 0x10B:
+        ndirs, = struct.unpack_from("<I", buf, opt + 92)
+        dirs = opt + 96
+    elif magic == 0x20B:
+        ndirs, = struct.unpack_from("<I", buf, opt + 108)
+        dirs = opt + 112
+    else:
+        raise ValueError(f"unknown optional header magic 0x{magic:x}")
+    if ndirs <= 2:
+        return None
+    res_rva, res_size = struct.unpack_from("<II", buf, dirs + 2 * 8)
+    if not res_rva or not res_size:
+        return None
+    sections = []
+    for i in range(nsections):
+        sh = opt + opt_size + i * 40
+        vsize, vaddr, raw_size, raw_ptr = struct.unpack_from("<IIII", buf, sh + 8)
+        sections.append((vaddr, vsize, raw_ptr, raw_size))
+    res_off = _pe_rva_to_offset(sections, res_rva)
+
+    # type (RT_VERSION) -> first name -> first language -> IMAGE_RESOURCE_DATA_ENTRY
+    node = 0
+    for level in range(3):
+        named, ids = struct.unpack_from("<HH", buf, res_off + node + 12)
+        entries = res_off + node + 16
+        chosen = None
+        for i in range(named + ids):
+            ident, target = struct.unpack_from("<II", buf, entries + i * 8)
+            if level == 0 and (ident & 0x80000000 or ident != RT_VERSION):
+                continue
+            chosen = target
+            break
+        if chosen is None:
+            return None
+        if level < 2:
+            if not chosen & 0x80000000:
+                raise ValueError("malformed resource directory")
+            node = chosen & 0x7FFFFFFF
+        else:
+            node = chosen
+    data_rva, data_size = struct.unpack_from("<II", buf, res_off + node)
+    return _pe_rva_to_offset(sections, data_rva), data_size
+
+def _align4(x: int, base: int) -> int:
+    return base + ((x - base + 3) & ~3)
+
+def _vs_block(buf: Any, off: int, base: int) -> Tuple[str, int, int, int, int]:
+    # returns key, end of block, value offset, value length in bytes, first child offset
+    length, value_len, value_type = struct.unpack_from("<HHH", buf, off)
+    if length < 6:
+        raise ValueError("malformed version block")
+    end = off + length
+    key_end = off + 6
+    while key_end + 2 <= end and buf[key_end:key_end + 2] != b"\0\0":
+        key_end += 2
+    key = bytes(buf[off + 6:key_end]).decode("utf-16-le", errors="replace")
+    value_off = _align4(key_end + 2, base)
+    value_bytes = value_len * 2 if value_type == 1 else value_len
+    return key, end, value_off, value_bytes, _align4(value_off + value_bytes, base)
+
+def _fixed_version(ms: int, ls: int) -> str:
+    return f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+
+def _parse_version_info(buf: Any, off: int, size: int) -> Dict[str, Any]:
+    key, end, value_off, value_bytes, child = _vs_block(buf, off, off)
+    if key != "VS_VERSION_INFO":
+        raise ValueError("malformed VS_VERSIONINFO")
+    end = min(end, off + size)
+    info: Dict[str, Any] = {}
+    if value_bytes >= 52:
+        sig, _, fms, fls, pms, pls = struct.unpack_from("<6I", buf, value_off)
+        if sig == VS_FIXEDFILEINFO_SIGNATURE:
+            info["fixed_file_version"] = _fixed_version(fms, fls)
+            info["fixed_product_version"] = _fixed_version(pms, pls)
+    strings: Dict[str, str] = {}
+    while child + 6 <= end:
+        ckey, cend, _, _, table = _vs_block(buf, child, off)
+        if ckey == "StringFileInfo":
+            while table + 6 <= cend:
+                _, tend, _, _, entry = _vs_block(buf, table, off)
+                while entry + 6 <= tend:
+                    skey, send, sval, sbytes, _ = _vs_block(buf, entry, off)
+                    raw = bytes(buf[sval:sval + sbytes]).decode("utf-16-le", errors="replace")
+                    strings.setdefault(skey, raw.split("\0", 1)[0].strip())
+                    entry = _align4(send, off)
+                table = _align4(tend, off)
+        child = _align4(cend, off)
+    info["strings"] = strings
+    info["product_version"] = strings.get("ProductVersion") or info.get("fixed_product_version", "")
+    info["file_version"] = strings.get("FileVersion") or info.get("fixed_file_version", "")
+    return info
+
+def read_pe_version_info(path: str) -> Dict[str, Any]:
+    if REPLAYING is not None:
+        return dict(REPLAYING.pe_versions.get(path) or {"error": "replay: file not in capture"})
+    info = _read_pe_version_info(path)
+    if RECORDING is not None:
+        RECORDING.pe_versions[path] = info
+    return info
+
+def _read_pe_version_info(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                located = _pe_version_resource(mm)
+                if located is None:
+                    return {"error": "no version resource"}
+                return _parse_version_info(mm, *located)
+    except (OSError, ValueError, struct.error, IndexError) as e:
+        return {"error": str(e) or type(e).__name__}
+
+def annotate_versions(findings: Any) -> Any:
+    for item in section_items(findings, actionable=True):
+        if item.path and path_is_file(item.path):
+            info = read_pe_version_info(item.path)
+            if not info.get("error"):
+                item.set_extra("product_version", info.get("product_version", ""))
+                item.set_extra("file_version", info.get("file_version", ""))
+    return findings
+
 def get_edge_product_version() -> str:
     for path in EDGE_LOCATIONS:
-        if os.path.exists(path):
-            ps = f"(Get-Item '{path}').VersionInfo.ProductVersion"
-            out, err, rc = powershell_exec(ps)
-            if rc == 0 and out:
-                return out
-            return f"Error: {err or 'unknown'}"
+        if path_is_file(path):
+            info = read_pe_version_info(path)
+            if info.get("product_version"):
+                return info["product_version"]
+            return f"Error: {info.get('error') or 'unknown'}"
     return "Not found"
 
-def scan_running_processes() -> Any:
-    try:
-        import psutil  # type: ignore
-    except Exception:
-        return {"error": "psutil missing", "hint": "pip install psutil"}
+def scan_running_processes(timeout: Optional[float] = None) -> Any:
+    if REPLAYING is not None:
+        if REPLAYING.psutil_missing:
+            return {"error": "psutil missing", "hint": "pip install psutil"}
+        infos = iter(REPLAYING.processes)
+    else:
+        try:
+            import psutil  # type: ignore
+        except Exception:
+            if RECORDING is not None:
+                RECORDING.psutil_missing = True
+            return {"error": "psutil missing", "hint": "pip install psutil"}
+        infos = (proc.info for proc in psutil.process_iter(['pid', 'name', 'exe']))
 
+    deadline = time.monotonic() + timeout if timeout is not None else None
     found = []
-    for proc in psutil.process_iter(['pid', 'name', 'exe']):
+    for info in infos:
+        if deadline is not None and time.monotonic() > deadline:
+            return timeout_result(found, "process enumeration exceeded its timeout")
+        if RECORDING is not None:
+            RECORDING.add_process(info)
         try:
-            name = (proc.info.get('name') or "").lower()
-            exe = (proc.info.get('exe') or "") or ""
+            name = (info.get('name') or "").lower()
+            exe = (info.get('exe') or "") or ""
             combined = f"{name} {exe}".lower()
             if any(term in combined for term in SEARCH_TERMS):
-                found.append({
-                    "name": proc.info.get('name'),
-                    "pid": proc.info.get('pid'),
-                    "path": exe
-                })
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+                found.append(Finding("process_conflicts", name=info.get('name'),
+                                     pid=info.get('pid'), path=exe))
         except Exception as e:
-            found.append({"error": f"Process scanning error: {e}"})
+            found.append(Finding("process_conflicts", raw={"error": f"Process scanning error: {e}"}))
     return found
 
-def scan_win32_startupcommand() -> Any:
+# matched processes get a second, per-process look; module names containing these are reported.
+# Modules under %SystemRoot% are never reported: keyboard layouts (KBDUS.DLL) and
+# Windows.Graphics.Capture.dll are mapped into ordinary GUI processes.
+HOOK_MODULE_TERMS = ("hook", "inject", "overlay", "capture", "kbd", "keyboard")
+PROCESS_ENRICH_WORKERS = 4
+PROCESS_ENRICH_TIMEOUT = 15.0
+PROCESS_ENRICH_ATTRS = ["ppid", "cmdline", "username", "create_time", "cpu_times", "memory_info", "memory_maps"]
+
+def process_details(pid: int) -> Dict[str, Any]:
+    if REPLAYING is not None:
+        return dict(REPLAYING.process_details.get(str(pid)) or {"enrich_error": "replay: process not in capture"})
+    details = _process_details(pid)
+    if RECORDING is not None:
+        with RECORDING._lock:
+            RECORDING.process_details[str(pid)] = details
+    return details
+
+def _process_details(pid: int) -> Dict[str, Any]:
+    import psutil  # type: ignore
+    try:
+        proc = psutil.Process(pid)
+        # oneshot() fills the per-process cache once; as_dict() then reads every attribute from it
+        with proc.oneshot():
+            info = proc.as_dict(attrs=PROCESS_ENRICH_ATTRS, ad_value=None)
+    except psutil.NoSuchProcess:
+        return {"enrich_error": "process exited"}
+    except Exception as e:
+        return {"enrich_error": str(e) or type(e).__name__}
+    details: Dict[str, Any] = {
+        "ppid": info.get("ppid"),
+        "cmdline": subprocess.list2cmdline(info["cmdline"]) if info.get("cmdline") else None,
+        "username": info.get("username"),
+        "create_time": datetime.fromtimestamp(info["create_time"]).isoformat() if info.get("create_time") else None,
+        "cpu_seconds": round(info["cpu_times"].user + info["cpu_times"].system, 3) if info.get("cpu_times") else None,
+        "rss_bytes": info["memory_info"].rss if info.get("memory_info") else None
+    }
+    details["hook_modules"] = hook_modules(mapping.path for mapping in info.get("memory_maps") or ())
+    return details
+
+def hook_modules(paths: Any) -> List[str]:
+    system_root = os.environ.get("SystemRoot", r"C:\Windows").rstrip("\\/").lower() + "\\"
+    hooks = set()
+    for path in paths:
+        if not path or path.replace("/", "\\").lower().startswith(system_root):
+            continue
+        module = split_any_path(path)[1]
+        low = module.lower()
+        if low.endswith(".dll") and any(term in low for term in HOOK_MODULE_TERMS):
+            hooks.add(module)
+    return sorted(hooks, key=str.lower)
+
+def enrich_processes(findings: Any, timeout: Optional[float] = None) -> Any:
+    # only the handful of matched processes are inspected, never the whole process table
+    targets = [item for item in section_items(findings, actionable=True) if isinstance(item.pid, int)]
+    if not targets:
+        return findings
+    if REPLAYING is None:
+        try:
+            import psutil  # type: ignore  # noqa: F401
+        except Exception:
+            return findings
+    ex = ThreadPoolExecutor(max_workers=min(PROCESS_ENRICH_WORKERS, len(targets)))
+    futures = {ex.submit(process_details, item.pid): item for item in targets}
+    pending = set(futures)
+    try:
+        for fut in as_completed(futures, timeout=timeout):
+            pending.discard(fut)
+            item = futures[fut]
+            try:
+                details = fut.result()
+            except Exception as e:
+                details = {"enrich_error": str(e) or type(e).__name__}
+            for key, value in details.items():
+                item.set_extra(key, value)
+    except FuturesTimeout:
+        for fut in pending:
+            futures[fut].set_extra("enrich_error", "timeout")
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    return findings
+
+def scan_win32_startupcommand(timeout: Optional[float] = None) -> Any:
     cmd = "Get-CimInstance -ClassName Win32_StartupCommand | Select-Object Name,Command | ConvertTo-Json -Depth 3"
-    out, err, rc = powershell_exec(cmd)
+    out, err, rc = powershell_exec(cmd, timeout=timeout)
+    if rc == PS_TIMEOUT_RC:
+        return timeout_result(match_lines(out, "startup_conflicts"), err)
     if rc != 0:
         return {"error": "WMI failed", "details": err}
     try:
@@ -526,15 +1246,16 @@ def scan_win32_startupcommand() -> Any:
             name = (it.get('Name') or "").strip()
             command = (it.get('Command') or "").strip()
             if any(term in f"{name} {command}".lower() for term in SEARCH_TERMS):
-                matches.append({"name": name, "command": command})
+                matches.append(Finding("startup_conflicts", name=name, command=command))
         return matches
     except json.JSONDecodeError:
-        lines = out.splitlines()
-        return [ln.strip() for ln in lines if any(term in ln.lower() for term in SEARCH_TERMS)]
+        return match_lines(out, "startup_conflicts")
 
-def scan_hkcu_run_values() -> Any:
+def scan_hkcu_run_values(timeout: Optional[float] = None) -> Any:
     cmd = r"Get-ItemProperty -Path 'HKCU:\Software\Microsoft\Windows\CurrentVersion\Run' | ConvertTo-Json -Depth 3"
-    out, err, rc = powershell_exec(cmd)
+    out, err, rc = powershell_exec(cmd, timeout=timeout)
+    if rc == PS_TIMEOUT_RC:
+        return timeout_result(match_lines(out, "hkcu_conflicts"), err)
     if rc != 0:
         return {"error": "HKCU read failed", "details": err}
     try:
@@ -546,7 +1267,7 @@ def scan_hkcu_run_values() -> Any:
                     continue
                 value = str(v) if v is not None else ""
                 if any(term in f"{k} {value}".lower() for term in SEARCH_TERMS):
-                    results.append({"name": k, "value": value})
+                    results.append(Finding("hkcu_conflicts", name=k, command=value))
         elif isinstance(parsed, list):
             for item in parsed:
                 for k, v in item.items():
@@ -554,15 +1275,16 @@ def scan_hkcu_run_values() -> Any:
                         continue
                     value = str(v) if v is not None else ""
                     if any(term in f"{k} {value}".lower() for term in SEARCH_TERMS):
-                        results.append({"name": k, "value": value})
+                        results.append(Finding("hkcu_conflicts", name=k, command=value))
         return results
     except json.JSONDecodeError:
-        lines = out.splitlines()
-        return [ln.strip() for ln in lines if any(term in ln.lower() for term in SEARCH_TERMS)]
+        return match_lines(out, "hkcu_conflicts")
 
-def scan_windows_services() -> Any:
+def scan_windows_services(timeout: Optional[float] = None) -> Any:
     cmd = "Get-CimInstance -ClassName Win32_Service | Select-Object Name,DisplayName,State,PathName | ConvertTo-Json -Depth 3"
-    out, err, rc = powershell_exec(cmd)
+    out, err, rc = powershell_exec(cmd, timeout=timeout)
+    if rc == PS_TIMEOUT_RC:
+        return timeout_result(match_lines(out, "service_conflicts"), err)
     if rc != 0:
         return {"error": "Services fetch failed", "details": err}
     try:
@@ -575,16 +1297,596 @@ def scan_windows_services() -> Any:
             state = (svc.get('State') or "").strip()
             path = (svc.get('PathName') or "").strip()
             if any(term in f"{name} {display} {path}".lower() for term in SEARCH_TERMS):
-                matches.append({"name": name, "display_name": display, "state": state, "path": path})
+                matches.append(Finding("service_conflicts", name=name, display_name=display, state=state, path=path))
         return matches
     except json.JSONDecodeError:
-        lines = out.splitlines()
-        return [ln.strip() for ln in lines if any(term in ln.lower() for term in SEARCH_TERMS)]
+        return match_lines(out, "service_conflicts")
+
+def parallel_match(section: str, func: Any, jobs: List[Tuple[Any, ...]], workers: int,
+                   timeout: Optional[float], what: str, sort_key: Any = None, name_of: Any = None) -> Any:
+    # run func(*job) on a thread pool and keep the entries whose name/command hit SEARCH_TERMS;
+    # entries that failed to read are always kept, an unreadable file is not a clean one.
+    # name_of(*job) gives a crashed job the same display name func would have used (default: file name)
+    matches: List[Any] = []
+    if not jobs:
+        return matches
+    ex = ThreadPoolExecutor(max_workers=min(workers, len(jobs)))
+    futures = {ex.submit(func, *job): job for job in jobs}
+    try:
+        for fut in as_completed(futures, timeout=timeout):
+            try:
+                entry = fut.result()
+            except Exception as e:
+                job = futures[fut]
+                path = job[-1]
+                name = name_of(*job) if name_of is not None else split_any_path(path)[1]
+                entry = Finding(section, name=name, command="", path=path,
+                                extra={"error": f"{type(e).__name__}: {e}", "file": path})
+            if entry and (entry.error or any(term in f"{entry.name} {entry.command}".lower()
+                                             for term in SEARCH_TERMS)):
+                matches.append(entry)
+    except FuturesTimeout:
+        return timeout_result(matches, f"{what} exceeded its timeout")
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    if sort_key is not None:
+        matches.sort(key=sort_key)
+    return matches
+
+# ---------------------------
+# Startup folders (.lnk Shell Link parsing, no WMI)
+# ---------------------------
+STARTUP_FOLDERS = [
+    r"%APPDATA%\Microsoft\Windows\Start Menu\Programs\Startup",
+    r"%ProgramData%\Microsoft\Windows\Start Menu\Programs\StartUp"
+]
+# Autostart keys Win32_StartupCommand also reports; HKCU Run itself has its own section
+STARTUP_RUN_KEYS = [
+    r"HKLM\SOFTWARE\Microsoft\Windows\CurrentVersion\Run",
+    r"HKLM\SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce",
+    r"HKLM\SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run",
+    r"HKLM\SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\RunOnce",
+    r"HKU\.DEFAULT\Software\Microsoft\Windows\CurrentVersion\Run",
+    r"HKU\.DEFAULT\Software\Microsoft\Windows\CurrentVersion\RunOnce",
+    r"HKCU\Software\Microsoft\Windows\CurrentVersion\RunOnce"
+]
+# offline images: machine hives backing the key prefixes above; HKCU is read from each profile's NTUSER.DAT
+STARTUP_RUN_HIVES = {
+    r"HKLM\SOFTWARE": r"C:\Windows\System32\config\SOFTWARE",
+    r"HKU\.DEFAULT": r"C:\Windows\System32\config\DEFAULT"
+}
+STARTUP_FOLDER_WORKERS = 8
+# "native" parses the Startup folders directly, "wmi" queries Win32_StartupCommand
+STARTUP_SCANNER = os.environ.get("ERRORBROKER_STARTUP_SCANNER", "native").lower()
+
+LNK_HEADER_SIZE = 0x4C
+LNK_HAS_ID_LIST, LNK_HAS_LINK_INFO, LNK_HAS_NAME, LNK_HAS_RELATIVE_PATH = 0x1, 0x2, 0x4, 0x8
+LNK_HAS_WORKING_DIR, LNK_HAS_ARGUMENTS, LNK_HAS_ICON, LNK_IS_UNICODE = 0x10, 0x20, 0x40, 0x80
+LNK_ENVIRONMENT_BLOCK = 0xA0000001
+
+def _c_string(data: bytes, off: int, wide: bool = False) -> str:
+    if wide:
+        end = off
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[off:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\0", off)
+    return data[off:end if end >= 0 else len(data)].decode("mbcs" if os.name == "nt" else "latin-1", errors="replace")
+
+def parse_lnk(data: bytes) -> Dict[str, str]:
+    if len(data) < LNK_HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != LNK_HEADER_SIZE:
+        raise ValueError("not a Shell Link file")
+    flags, = struct.unpack_from("<I", data, 0x14)
+    pos = LNK_HEADER_SIZE
+    if flags & LNK_HAS_ID_LIST:
+        pos += 2 + struct.unpack_from("<H", data, pos)[0]
+
+    info: Dict[str, str] = {}
+    if flags & LNK_HAS_LINK_INFO:
+        size, header_size, li_flags, _, base_off, _, suffix_off = struct.unpack_from("<7I", data, pos)
+        base, suffix = "", ""
+        if header_size >= 0x24:
+            base_w, suffix_w = struct.unpack_from("<II", data, pos + 0x1C)
+            if li_flags & 0x1 and base_w:
+                base = _c_string(data, pos + base_w, wide=True)
+            if suffix_w:
+                suffix = _c_string(data, pos + suffix_w, wide=True)
+        if li_flags & 0x1 and not base and base_off:
+            base = _c_string(data, pos + base_off)
+        if not suffix and suffix_off:
+            suffix = _c_string(data, pos + suffix_off)
+        if base:
+            info["target"] = base + suffix
+        pos += size
+
+    wide = bool(flags & LNK_IS_UNICODE)
+    for flag, key in ((LNK_HAS_NAME, "description"), (LNK_HAS_RELATIVE_PATH, "relative_path"),
+                      (LNK_HAS_WORKING_DIR, "working_dir"), (LNK_HAS_ARGUMENTS, "arguments"),
+                      (LNK_HAS_ICON, "icon")):
+        if flags & flag:
+            count, = struct.unpack_from("<H", data, pos)
+            nbytes = count * 2 if wide else count
+            raw = data[pos + 2:pos + 2 + nbytes]
+            info[key] = raw.decode("utf-16-le", errors="replace") if wide else raw.decode("latin-1", errors="replace")
+            pos += 2 + nbytes
+
+    # ExtraData: advertised/installer shortcuts often carry the target only here
+    while "target" not in info and pos + 8 <= len(data):
+        block_size, signature = struct.unpack_from("<II", data, pos)
+        if block_size < 8:
+            break
+        if signature == LNK_ENVIRONMENT_BLOCK and block_size >= 0x314:
+            info["target"] = _c_string(data, pos + 8 + 260, wide=True) or _c_string(data, pos + 8)
+        pos += block_size
+    return info
+
+def _startup_name(source: str, path: str) -> str:
+    return os.path.splitext(split_any_path(path)[1])[0]
+
+def _startup_entry(source: str, path: str) -> Optional[Finding]:
+    folder, filename = split_any_path(path)
+    name, ext = os.path.splitext(filename)
+    if filename.lower() == "desktop.ini":
+        return None
+    if ext.lower() != ".lnk":
+        return Finding("startup_conflicts", name=name, command=path, source=source)
+    try:
+        info = parse_lnk(read_file_bytes(path))
+    except (OSError, ValueError, struct.error) as e:
+        return Finding("startup_conflicts", name=name, command="", source=source, extra={"error": str(e)})
+    target = info.get("target") or info.get("relative_path") or ""
+    if target.startswith(".") and info.get("relative_path"):
+        target = os.path.normpath(os.path.join(folder, target))
+    if " " in target and not target.startswith('"'):
+        target = f'"{target}"'
+    command = f"{target} {info.get('arguments', '')}".strip()
+    return Finding("startup_conflicts", name=name, command=command, source=source)
+
+def startup_folders(image_root: Optional[str] = None) -> List[str]:
+    if image_root is None:
+        return [expand_path(folder) for folder in STARTUP_FOLDERS]
+    folders = [image_path(image_root, r"C:\ProgramData\Microsoft\Windows\Start Menu\Programs\StartUp")]
+    for _, profile in image_user_profiles(image_root):
+        folders.append(image_path(profile, r"AppData\Roaming\Microsoft\Windows\Start Menu\Programs\Startup"))
+    return folders
+
+def _run_key_findings(location: str, values: Dict[str, Any]) -> List[Finding]:
+    found = []
+    for name, value in values.items():
+        value = str(value) if value is not None else ""
+        if any(term in f"{name} {value}".lower() for term in SEARCH_TERMS):
+            found.append(Finding("startup_conflicts", name=name, command=value, source=location))
+    return found
+
+def startup_run_entries(image_root: Optional[str] = None) -> List[Finding]:
+    found: List[Finding] = []
+    if image_root is None:
+        for key in STARTUP_RUN_KEYS:
+            try:
+                found.extend(_run_key_findings(key, read_registry_values(key)))
+            except (OSError, ImportError):
+                continue
+        return found
+    hives = [(prefix, prefix, image_path(image_root, hive_file)) for prefix, hive_file in STARTUP_RUN_HIVES.items()]
+    hives += [("HKCU", f"{user}: HKCU", image_path(profile, "NTUSER.DAT"))
+              for user, profile in image_user_profiles(image_root)]
+    for prefix, location, hive_path in hives:
+        subkeys = [key[len(prefix) + 1:] for key in STARTUP_RUN_KEYS if key.startswith(prefix + "\\")]
+        try:
+            with open_hive(hive_path) as (buf, root):
+                for subkey in subkeys:
+                    nk = hive_open_key(buf, root, subkey)
+                    if nk is not None:
+                        found.extend(_run_key_findings(f"{location}\\{subkey}", hive_values(buf, nk)))
+        except (OSError, ValueError, struct.error):
+            continue
+    return found
+
+def scan_startup_folders(timeout: Optional[float] = None, image_root: Optional[str] = None) -> Any:
+    run_entries = startup_run_entries(image_root)
+    files = []
+    for folder in startup_folders(image_root):
+        try:
+            files.extend((folder, path) for path in list_folder_files(folder))
+        except OSError:
+            continue
+    found = parallel_match("startup_conflicts", _startup_entry, files, STARTUP_FOLDER_WORKERS, timeout,
+                           "startup folder scan", name_of=_startup_name)
+    if is_partial(found):
+        found["items"] = run_entries + found["items"]
+        return found
+    return sorted(run_entries + found, key=lambda e: (e.source or "", (e.name or "").lower()))
+
+# ---------------------------
+# Scheduled tasks (task XML definitions, no Get-ScheduledTask)
+# ---------------------------
+TASKS_DIR = r"%SystemRoot%\System32\Tasks"
+SCHEDULED_TASK_WORKERS = 8
+
+def parse_task_xml(source: Any) -> Dict[str, Any]:
+    # streaming parse: only Exec actions and Settings/Enabled are kept, everything else is dropped as read
+    execs: List[str] = []
+    enabled = True
+    stack: List[str] = []
+    command: Optional[str] = None
+    arguments = ""
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if event == "start":
+            stack.append(tag)
+            if tag == "Exec":
+                command, arguments = "", ""
+            continue
+        stack.pop()
+        if command is not None and tag == "Command":
+            command = (elem.text or "").strip()
+        elif command is not None and tag == "Arguments":
+            arguments = (elem.text or "").strip()
+        elif tag == "Exec":
+            execs.append(f"{command} {arguments}".strip())
+            command = None
+        elif tag == "Enabled" and stack and stack[-1] == "Settings":
+            enabled = (elem.text or "").strip().lower() != "false"
+        elem.clear()
+    return {"execs": execs, "enabled": enabled}
+
+def _task_name(tasks_root: str, path: str) -> str:
+    # task path relative to the Tasks folder, as Task Scheduler shows it
+    return "\\" + path[len(tasks_root):].lstrip("\\/").replace("/", "\\")
+
+def _task_entry(tasks_root: str, path: str) -> Optional[Finding]:
+    name = _task_name(tasks_root, path)
+    try:
+        data = read_file_bytes(path)
+        # cheap pre-filter: a task whose name and XML mention no search term can never match
+        encoding = "utf-16" if data[:2] in (b"\xff\xfe", b"\xfe\xff") else "utf-8"
+        text = f"{name} {data.decode(encoding, errors='replace')}".lower()
+        if not any(term in text for term in SEARCH_TERMS):
+            return None
+        info = parse_task_xml(io.BytesIO(data))
+    except (OSError, ET.ParseError, LookupError, ValueError) as e:
+        # LookupError/ValueError: unknown or unsupported encoding declared in the XML prolog
+        return Finding("scheduled_task_conflicts", name=name, command="", state="Unknown", path=path,
+                       extra={"error": str(e)})
+    if not info["execs"]:
+        return None
+    return Finding("scheduled_task_conflicts", name=name, command="; ".join(info["execs"]),
+                   state="Enabled" if info["enabled"] else "Disabled", path=path)
+
+def scan_scheduled_tasks(timeout: Optional[float] = None, image_root: Optional[str] = None) -> Any:
+    if image_root is None:
+        tasks_root = expand_path(TASKS_DIR)
+    else:
+        tasks_root = image_path(image_root, r"C:\Windows\System32\Tasks")
+    walk_errors: List[str] = []
+    try:
+        files = [(tasks_root, path) for path in walk_folder_files(tasks_root, walk_errors)]
+    except OSError as e:
+        return {"error": "Scheduled tasks unavailable", "details": f"{tasks_root}: {e.strerror or e}"}
+    found = parallel_match("scheduled_task_conflicts", _task_entry, files, SCHEDULED_TASK_WORKERS, timeout,
+                           "scheduled task scan", sort_key=lambda e: e.name.lower(), name_of=_task_name)
+    if walk_errors:
+        details = "; ".join(walk_errors)
+        if is_partial(found):
+            found["details"] = f"{found['details']}; {details}" if found.get("details") else details
+        else:
+            found = {"error": "unreadable task folders", "partial": True, "details": details, "items": found}
+    return found
+
+SCANNERS = [
+    ("process_conflicts", scan_running_processes),
+    ("startup_conflicts", scan_startup_folders if STARTUP_SCANNER == "native" else scan_win32_startupcommand),
+    ("hkcu_conflicts", scan_hkcu_run_values),
+    ("service_conflicts", scan_windows_services),
+    ("scheduled_task_conflicts", scan_scheduled_tasks)
+]
+
+def collect_detections(budget: Optional[float] = None) -> Dict[str, Any]:
+    deadline = time.monotonic() + (SCAN_BUDGET_SECONDS if budget is None else budget)
+
+    def time_left(key: str) -> float:
+        left = deadline - time.monotonic()
+        return max(0.0, min(SCANNER_TIMEOUTS.get(key, left), left))
+
+    detections = {
+        "timestamp": datetime.now().isoformat(),
+        "system": current_system_info(),
+        "edge_version": get_edge_product_version()
+    }
+    timings: Dict[str, Tuple[str, float]] = {}
+    for key, scanner in SCANNERS:
+        left = time_left(key)
+        if left <= 0:
+            detections[key] = timeout_result([], "scan budget exhausted")
+            timings[key] = (scanner.__name__, 0.0)
+            continue
+        started = time.monotonic()
+        detections[key] = scanner(timeout=left)
+        timings[key] = (scanner.__name__, time.monotonic() - started)
+    enrich_processes(detections.get("process_conflicts"),
+                     max(0.0, min(PROCESS_ENRICH_TIMEOUT, deadline - time.monotonic())))
+    annotate_versions(detections.get("process_conflicts"))
+    METRICS.observe_scan(detections, timings)
+    return detections
+
+# ---------------------------
+# Offline image support (mounted disk images)
+# ---------------------------
+def image_path(image_root: str, win_path: str) -> str:
+    # map "C:\Some\Path" onto a mounted image, resolving each component case-insensitively
+    parts = [p for p in win_path.split(":", 1)[-1].replace("/", "\\").split("\\") if p]
+    current = image_root
+    for part in parts:
+        candidate = os.path.join(current, part)
+        if not os.path.exists(candidate) and os.path.isdir(current):
+            low = part.lower()
+            try:
+                candidate = next((os.path.join(current, e) for e in os.listdir(current) if e.lower() == low), candidate)
+            except OSError:
+                pass
+        current = candidate
+    return current
+
+def image_user_profiles(image_root: str) -> List[Tuple[str, str]]:
+    users_dir = image_path(image_root, r"C:\Users")
+    try:
+        names = sorted(os.listdir(users_dir))
+    except OSError:
+        return []
+    return [(n, os.path.join(users_dir, n)) for n in names if os.path.isdir(os.path.join(users_dir, n))]
+
+# ---------------------------
+# Offline registry hives (regf)
+# ---------------------------
+HIVE_BINS_OFFSET = 4096
+REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD, REG_MULTI_SZ, REG_QWORD = 1, 2, 3, 4, 7, 11
+SERVICE_START_MODES = {0: "Boot", 1: "System", 2: "Auto", 3: "Manual", 4: "Disabled"}
+SERVICE_WIN32 = 0x30
+
+def _hive_cell(buf: Any, off: int) -> int:
+    # cell offsets are relative to the first hive bin; skip the 4-byte cell size
+    return HIVE_BINS_OFFSET + off + 4
+
+def _hive_name(buf: Any, start: int, length: int, compressed: bool) -> str:
+    raw = bytes(buf[start:start + length])
+    return raw.decode("latin-1") if compressed else raw.decode("utf-16-le", errors="replace")
+
+def _hive_key_name(buf: Any, nk: int) -> str:
+    flags, = struct.unpack_from("<H", buf, nk + 2)
+    name_len, = struct.unpack_from("<H", buf, nk + 0x48)
+    return _hive_name(buf, nk + 0x4C, name_len, bool(flags & 0x20))
+
+def _hive_subkey_offsets(buf: Any, list_off: int):
+    cell = _hive_cell(buf, list_off)
+    sig = bytes(buf[cell:cell + 2])
+    count, = struct.unpack_from("<H", buf, cell + 2)
+    if sig in (b"lf", b"lh"):
+        for i in range(count):
+            yield struct.unpack_from("<I", buf, cell + 4 + i * 8)[0]
+    elif sig == b"li":
+        for i in range(count):
+            yield struct.unpack_from("<I", buf, cell + 4 + i * 4)[0]
+    elif sig == b"ri":
+        for i in range(count):
+            yield from _hive_subkey_offsets(buf, struct.unpack_from("<I", buf, cell + 4 + i * 4)[0])
+    else:
+        raise ValueError(f"unknown subkey list {sig!r}")
+
+def hive_subkeys(buf: Any, nk: int):
+    count, = struct.unpack_from("<I", buf, nk + 0x14)
+    list_off, = struct.unpack_from("<I", buf, nk + 0x1C)
+    if not count or list_off == 0xFFFFFFFF:
+        return
+    for off in _hive_subkey_offsets(buf, list_off):
+        child = _hive_cell(buf, off)
+        if buf[child:child + 2] == b"nk":
+            yield _hive_key_name(buf, child), child
+
+def hive_open_key(buf: Any, nk: int, path: str) -> Optional[int]:
+    for part in (p for p in path.split("\\") if p):
+        low = part.lower()
+        nk = next((child for name, child in hive_subkeys(buf, nk) if name.lower() == low), None)
+        if nk is None:
+            return None
+    return nk
+
+def _hive_value_data(buf: Any, vk: int) -> bytes:
+    size, data_off = struct.unpack_from("<II", buf, vk + 4)
+    if size & 0x80000000:
+        # up to 4 bytes stored inline in the offset field
+        return bytes(buf[vk + 8:vk + 8 + (size & 0x7FFFFFFF)])
+    if size == 0 or data_off == 0xFFFFFFFF:
+        return b""
+    cell = _hive_cell(buf, data_off)
+    if size > 16344 and buf[cell:cell + 2] == b"db":
+        segments, seg_list = struct.unpack_from("<HI", buf, cell + 2)
+        seg_cell = _hive_cell(buf, seg_list)
+        chunks = []
+        for i in range(segments):
+            seg = _hive_cell(buf, struct.unpack_from("<I", buf, seg_cell + i * 4)[0])
+            chunks.append(bytes(buf[seg:seg + min(16344, size - 16344 * i)]))
+        return b"".join(chunks)[:size]
+    return bytes(buf[cell:cell + size])
+
+def _hive_decode(value_type: int, data: bytes) -> Any:
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        return data.decode("utf-16-le", errors="replace").split("\0", 1)[0]
+    if value_type == REG_MULTI_SZ:
+        return [s for s in data.decode("utf-16-le", errors="replace").split("\0") if s]
+    if value_type == REG_DWORD and len(data) >= 4:
+        return struct.unpack_from("<I", data)[0]
+    if value_type == REG_QWORD and len(data) >= 8:
+        return struct.unpack_from("<Q", data)[0]
+    return data.hex()
+
+def hive_values(buf: Any, nk: int) -> Dict[str, Any]:
+    count, list_off = struct.unpack_from("<II", buf, nk + 0x24)
+    values: Dict[str, Any] = {}
+    if not count or list_off == 0xFFFFFFFF:
+        return values
+    cell = _hive_cell(buf, list_off)
+    for i in range(count):
+        vk = _hive_cell(buf, struct.unpack_from("<I", buf, cell + i * 4)[0])
+        if buf[vk:vk + 2] != b"vk":
+            continue
+        name_len, = struct.unpack_from("<H", buf, vk + 2)
+        value_type, flags = struct.unpack_from("<IH", buf, vk + 0x0C)
+        name = _hive_name(buf, vk + 0x14, name_len, bool(flags & 0x1))
+        values[name] = _hive_decode(value_type, _hive_value_data(buf, vk))
+    return values
+
+@contextmanager
+def open_hive(path: str):
+    # memory-maps a hive file and yields (buffer, root key offset); nothing is copied up front
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[0:4] != b"regf":
+                raise ValueError(f"{path}: not a registry hive")
+            root, = struct.unpack_from("<I", mm, 0x24)
+            yield mm, _hive_cell(mm, root)
+
+HKCU_RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
+
+def scan_offline_hkcu_run_values(ntuser_path: str) -> Any:
+    try:
+        with open_hive(ntuser_path) as (buf, root):
+            nk = hive_open_key(buf, root, HKCU_RUN_KEY)
+            if nk is None:
+                return []
+            results = []
+            for k, v in hive_values(buf, nk).items():
+                value = str(v) if v is not None else ""
+                if any(term in f"{k} {value}".lower() for term in SEARCH_TERMS):
+                    results.append(Finding("hkcu_conflicts", name=k, command=value))
+            return results
+    except (OSError, ValueError, struct.error) as e:
+        return {"error": "Hive read failed", "details": str(e)}
+
+def scan_offline_services(system_path: str) -> Any:
+    try:
+        with open_hive(system_path) as (buf, root):
+            select = hive_open_key(buf, root, "Select")
+            current = hive_values(buf, select).get("Current", 1) if select is not None else 1
+            services = hive_open_key(buf, root, f"ControlSet{current:03d}\\Services")
+            if services is None:
+                return {"error": "Services fetch failed", "details": "no Services key in hive"}
+            matches = []
+            for name, nk in hive_subkeys(buf, services):
+                vals = hive_values(buf, nk)
+                if not isinstance(vals.get("Type"), int) or not vals["Type"] & SERVICE_WIN32:
+                    continue
+                display = str(vals.get("DisplayName") or "").strip()
+                path = str(vals.get("ImagePath") or "").strip()
+                # no runtime state offline: report the configured start mode instead
+                state = SERVICE_START_MODES.get(vals.get("Start"), "Unknown")
+                if any(term in f"{name} {display} {path}".lower() for term in SEARCH_TERMS):
+                    matches.append(Finding("service_conflicts", name=name, display_name=display, state=state, path=path))
+            return matches
+    except (OSError, ValueError, struct.error) as e:
+        return {"error": "Services fetch failed", "details": str(e)}
+
+def offline_system_info(image_root: str) -> Dict[str, Any]:
+    info = {"host": os.path.basename(os.path.normpath(image_root)), "os": "Windows", "release": "",
+            "platform": f"offline image {image_root}"}
+    try:
+        with open_hive(image_path(image_root, r"C:\Windows\System32\config\SYSTEM")) as (buf, root):
+            select = hive_open_key(buf, root, "Select")
+            current = hive_values(buf, select).get("Current", 1) if select is not None else 1
+            nk = hive_open_key(buf, root, f"ControlSet{current:03d}\\Control\\ComputerName\\ComputerName")
+            name = hive_values(buf, nk).get("ComputerName") if nk is not None else None
+            if name:
+                info["host"] = str(name)
+    except (OSError, ValueError, struct.error):
+        pass
+    try:
+        with open_hive(image_path(image_root, r"C:\Windows\System32\config\SOFTWARE")) as (buf, root):
+            nk = hive_open_key(buf, root, r"Microsoft\Windows NT\CurrentVersion")
+            if nk is not None:
+                vals = hive_values(buf, nk)
+                info["os"] = str(vals.get("ProductName") or "Windows")
+                info["release"] = str(vals.get("DisplayVersion") or vals.get("CurrentBuild") or "")
+    except (OSError, ValueError, struct.error):
+        pass
+    return info
+
+def scan_offline_profiles(image_root: str) -> Any:
+    # HKCU Run of every profile in the image, each finding tagged with its profile name
+    hkcu: Any = []
+    errors = []
+    for user, profile in image_user_profiles(image_root):
+        ntuser = image_path(profile, "NTUSER.DAT")
+        if not os.path.isfile(ntuser):
+            continue
+        found = scan_offline_hkcu_run_values(ntuser)
+        if isinstance(found, dict):
+            errors.append(f"{user}: {found.get('details')}")
+            continue
+        for item in found:
+            item.source = sys.intern(user)
+        hkcu.extend(found)
+    if errors:
+        # keep the profiles that did parse, flagged like a partial scan
+        hkcu = {"error": "HKCU read failed", "partial": True, "details": "; ".join(errors), "items": hkcu}
+    return hkcu
+
+def collect_offline_detections(image_root: str) -> Dict[str, Any]:
+    edge_version = "Not found"
+    for loc in EDGE_LOCATIONS:
+        path = image_path(image_root, loc)
+        if os.path.isfile(path):
+            info = read_pe_version_info(path)
+            edge_version = info.get("product_version") or f"Error: {info.get('error') or 'unknown'}"
+            break
+
+    detections = {
+        "timestamp": datetime.now().isoformat(),
+        "system": offline_system_info(image_root),
+        "edge_version": edge_version,
+        # placeholder, not a scanner result: it has no timing and is left out of the metrics
+        "process_conflicts": {"error": "not available for offline images"}
+    }
+    timings: Dict[str, Tuple[str, float]] = {}
+    for key, scanner, kwargs in (
+        ("startup_conflicts", scan_startup_folders, {"image_root": image_root}),
+        ("hkcu_conflicts", scan_offline_profiles, {"image_root": image_root}),
+        ("service_conflicts", scan_offline_services,
+         {"system_path": image_path(image_root, r"C:\Windows\System32\config\SYSTEM")}),
+        ("scheduled_task_conflicts", scan_scheduled_tasks, {"image_root": image_root})
+    ):
+        started = time.monotonic()
+        detections[key] = scanner(**kwargs)
+        timings[key] = (scanner.__name__, time.monotonic() - started)
+    METRICS.observe_scan(detections, timings)
+    return detections
 
 # ---------------------------
 # Remediation actions
 # ---------------------------
+def kill_scanned_process(finding: Finding) -> Dict[str, Any]:
+    # the finding may come from a cached scan: make sure its PID still belongs to the same process
+    if REPLAYING is None:
+        try:
+            import psutil  # type: ignore
+        except Exception:
+            return {"ok": False, "error": "psutil missing"}
+        try:
+            proc = psutil.Process(finding.pid)
+            with proc.oneshot():
+                name, started = proc.name(), proc.create_time()
+        except psutil.NoSuchProcess:
+            return {"ok": False, "message": "Process no longer exists"}
+        except Exception as e:
+            return {"ok": False, "message": str(e)}
+        if (name or "").lower() != (finding.name or "").lower():
+            return {"ok": False, "message": f"PID {finding.pid} now belongs to {name!r}, not {finding.name!r}"}
+        recorded = (finding.extra or {}).get("create_time")
+        if recorded and datetime.fromtimestamp(started).isoformat() != recorded:
+            return {"ok": False, "message": f"PID {finding.pid} was reused by another {name!r} since the scan"}
+    return kill_process_by_pid(finding.pid)
+
 def kill_process_by_pid(pid: int) -> Dict[str, Any]:
+    if REPLAYING is not None:
+        return replay_dry_run(f"kill {pid}")
     try:
         import psutil  # type: ignore
     except Exception:
@@ -602,6 +1904,8 @@ def kill_process_by_pid(pid: int) -> Dict[str, Any]:
         return {"ok": False, "message": str(e)}
 
 def delete_hkcu_run_value(value_name: str) -> Dict[str, Any]:
+    if REPLAYING is not None:
+        return replay_dry_run(f"delete HKCU Run value {value_name}")
     safe = value_name.replace("'", "''")
     cmd = f"Remove-ItemProperty -Path 'HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\Run' -Name '{safe}' -ErrorAction Stop; 'OK'"
     out, err, rc = powershell_exec(cmd)
@@ -610,6 +1914,9 @@ def delete_hkcu_run_value(value_name: str) -> Dict[str, Any]:
     return {"ok": False, "message": err or out or "Unknown error"}
 
 def stop_and_disable_service_by_name(svc_name: str) -> Dict[str, Any]:
+    if REPLAYING is not None:
+        msg = replay_dry_run(f"stop/disable {svc_name}")["message"]
+        return {"stop": msg, "disable": msg}
     results = {"stop": None, "disable": None}
     try:
         p1 = subprocess.run(['sc', 'stop', svc_name], capture_output=True, text=True)
@@ -623,6 +1930,16 @@ def stop_and_disable_service_by_name(svc_name: str) -> Dict[str, Any]:
         results['disable'] = str(e)
     return results
 
+def disable_scheduled_task(task_name: str) -> Dict[str, Any]:
+    if REPLAYING is not None:
+        return replay_dry_run(f"disable task {task_name}")
+    try:
+        p = subprocess.run(['schtasks', '/Change', '/TN', task_name, '/Disable'], capture_output=True, text=True)
+    except Exception as e:
+        return {"ok": False, "message": str(e)}
+    message = ((p.stdout or "") + (p.stderr or "")).strip()
+    return {"ok": p.returncode == 0, "message": message or f"schtasks exited with {p.returncode}"}
+
 # ---------------------------
 # Localized prompts helper
 # ---------------------------
@@ -638,11 +1955,107 @@ def prompt_choice_localized(question: str, options: Dict[str, str]) -> str:
         print(t("invalid_choice"))
 
 # ---------------------------
-# Report save functions (10 formats)
+# Report save functions (11 formats)
 # ---------------------------
+REPORT_SECTIONS = ("process_conflicts", "startup_conflicts", "hkcu_conflicts", "service_conflicts",
+                   "scheduled_task_conflicts", "actions")
+
+SECTION_TITLES = {
+    "process_conflicts": "Process findings",
+    "startup_conflicts": "Startup entries",
+    "hkcu_conflicts": "HKCU Run values",
+    "service_conflicts": "Service findings",
+    "scheduled_task_conflicts": "Scheduled tasks",
+    "actions": "Actions performed"
+}
+
+# Columnar layout shared by the CSV and Parquet writers: one row per finding/action.
+# scan_time/host keep rows from many scans apart once they are loaded into one table.
+FINDING_COLUMNS = ("scan_time", "host", "section", "name", "pid", "path", "command", "state", "matched_terms", "action", "result")
+FINDING_BATCH_SIZE = 4096
+
+def find_matched_terms(text: str) -> Tuple[str, ...]:
+    low = text.lower()
+    return tuple(term for term in SEARCH_TERMS if term in low)
+
+def flatten_finding(section: str, item: Any) -> Tuple[Any, ...]:
+    action = ""
+    result = ""
+    if isinstance(item, Action) or (section == "actions" and isinstance(item, dict) and "action" in item):
+        if isinstance(item, Action):
+            action, res, item = item.action, item.result, item.target
+        else:
+            action, res, item = item.get("action") or "", item.get("result"), item.get("target") or {}
+        if res is not None:
+            result = res if isinstance(res, str) else json.dumps(res, ensure_ascii=False)
+    if isinstance(item, Finding) and item.raw is not None:
+        item = item.raw
+    if isinstance(item, Finding):
+        if item.error:
+            result = json.dumps(item.to_dict(), ensure_ascii=False)
+        name = item.name or ""
+        pid = item.pid if isinstance(item.pid, int) else None
+        path = item.path or ""
+        command = item.command or ""
+        state = item.state or ""
+        display = item.display_name or ""
+    elif isinstance(item, dict):
+        if item.get("error"):
+            result = json.dumps(item, ensure_ascii=False, default=to_jsonable)
+        name = str(item.get("name") or "")
+        pid = item.get("pid")
+        pid = pid if isinstance(pid, int) else None
+        path = str(item.get("path") or "")
+        command = str(item.get("command") or item.get("value") or "")
+        state = str(item.get("state") or "")
+        display = str(item.get("display_name") or "")
+    else:
+        # plain-text fallback lines from scanners whose JSON could not be parsed
+        name, pid, path, state, display = "", None, "", "", ""
+        command = str(item)
+    terms = find_matched_terms(f"{name} {display} {path} {command}")
+    return (section, name, pid, path, command, state, terms, action, result)
+
+def iter_section_items(section: str, val: Any):
+    if not val:
+        return
+    if is_partial(val):
+        # marker row carrying the timeout, followed by whatever was salvaged
+        yield {k: v for k, v in val.items() if k != "items"}
+        yield from section_items(val)
+    else:
+        yield from (val if isinstance(val, (list, tuple)) else [val])
+
+def iter_section_rows(section: str, val: Any):
+    for item in iter_section_items(section, val):
+        yield flatten_finding(section, item)
+
+def scan_key(report: Dict[str, Any]) -> Tuple[Optional[datetime], Optional[str]]:
+    try:
+        scan_time = datetime.fromisoformat(str(report.get("timestamp")))
+    except ValueError:
+        scan_time = None
+    return scan_time, (report.get("system") or {}).get("host")
+
+def iter_finding_rows(report: Dict[str, Any]):
+    key = scan_key(report)
+    for section in REPORT_SECTIONS:
+        for row in iter_section_rows(section, report.get(section)):
+            yield key + row
+
+def iter_finding_batches(report: Dict[str, Any], size: int = FINDING_BATCH_SIZE):
+    batch = []
+    for row in iter_finding_rows(report):
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 def save_json(report: Dict[str, Any], path: str) -> str:
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=4, ensure_ascii=False)
+        json.dump(report, f, indent=4, ensure_ascii=False, default=to_jsonable)
     return path
 
 def save_txt(report: Dict[str, Any], path: str) -> str:
@@ -656,33 +2069,35 @@ def save_txt(report: Dict[str, Any], path: str) -> str:
     lines.append("")
     def dump_section(title: str, content: Any) -> None:
         lines.append("== " + title + " ==")
+        if is_partial(content):
+            lines.append(f"  ({content.get('error')}, partial results: {content.get('details') or ''})")
+            content = section_items(content)
         if not content:
             lines.append("  (no entries)")
         elif isinstance(content, (list, tuple)):
             for item in content:
-                lines.append("  " + json.dumps(item, ensure_ascii=False))
+                lines.append("  " + json.dumps(item, ensure_ascii=False, default=to_jsonable))
         else:
-            lines.append("  " + json.dumps(content, ensure_ascii=False))
+            lines.append("  " + json.dumps(content, ensure_ascii=False, default=to_jsonable))
         lines.append("")
-    dump_section("Process findings", report.get('process_conflicts'))
-    dump_section("Win32 StartupCommand", report.get('startup_conflicts'))
-    dump_section("HKCU Run values", report.get('hkcu_conflicts'))
-    dump_section("Service findings", report.get('service_conflicts'))
-    dump_section("Actions performed", report.get('actions'))
+    for section in REPORT_SECTIONS:
+        dump_section(SECTION_TITLES[section], report.get(section))
     with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
     return path
 
 def save_csv(report: Dict[str, Any], path: str) -> str:
     import csv
-    rows = []
-    rows.append(["section", "item_json"])
-    for k in ("process_conflicts","startup_conflicts","hkcu_conflicts","service_conflicts","actions"):
-        val = report.get(k)
-        rows.append([k, json.dumps(val, ensure_ascii=False)])
+    terms_idx = FINDING_COLUMNS.index("matched_terms")
     with open(path, "w", encoding="utf-8", newline='') as f:
         writer = csv.writer(f)
-        writer.writerows(rows)
+        writer.writerow(FINDING_COLUMNS)
+        for batch in iter_finding_batches(report):
+            for row in batch:
+                row = list(row)
+                row[0] = row[0].isoformat() if row[0] else ""
+                row[terms_idx] = ";".join(row[terms_idx])
+                writer.writerow(row)
     return path
 
 def save_xml(report: Dict[str, Any], path: str) -> str:
@@ -694,27 +2109,175 @@ def save_xml(report: Dict[str, Any], path: str) -> str:
     for k,v in report.get("system", {}).items():
         el = SubElement(system, k)
         el.text = str(v)
-    for section in ("process_conflicts","startup_conflicts","hkcu_conflicts","service_conflicts","actions"):
+    for section in REPORT_SECTIONS:
         sec_el = SubElement(root, section)
         items = report.get(section) or []
+        if is_partial(items):
+            sec_el.set("error", str(items.get("error")))
+            sec_el.set("partial", "true")
+            items = section_items(items)
         if isinstance(items, dict):
             el = SubElement(sec_el, "item")
-            el.text = json.dumps(items, ensure_ascii=False)
+            el.text = json.dumps(items, ensure_ascii=False, default=to_jsonable)
         else:
             for it in items:
                 item_el = SubElement(sec_el, "item")
-                item_el.text = json.dumps(it, ensure_ascii=False)
+                item_el.text = json.dumps(it, ensure_ascii=False, default=to_jsonable)
     ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
     return path
 
+HTML_CHUNK_ROWS = 2000
+
+HTML_REPORT_STYLE = """
+body{font-family:Segoe UI,Arial,sans-serif;margin:1.5em;color:#222}
+h1{margin-bottom:.2em}
+.meta td{padding:0 1em 0 0}
+details{margin:1em 0;border:1px solid #ccc;border-radius:4px}
+summary{cursor:pointer;padding:.5em;background:#f3f3f3;font-weight:600}
+.tools{padding:.5em}
+.tools input{width:24em}
+.scroller{height:480px;overflow:auto;border-top:1px solid #ddd}
+table{border-collapse:collapse;width:100%;table-layout:fixed}
+th{position:sticky;top:0;background:#fafafa;cursor:pointer;text-align:left;border-bottom:1px solid #ccc;padding:2px 6px}
+td{height:24px;padding:0 6px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;border-bottom:1px solid #eee}
+tr.err td{background:#fff1f0}
+tbody tr{cursor:pointer}
+.detail{display:none;margin:0;padding:.5em;max-height:240px;overflow:auto;white-space:pre-wrap;border-top:1px solid #ddd;background:#fcfcfc}
+"""
+
+# rows are kept as JSON chunks and only the visible window of a table is turned into DOM nodes
+HTML_REPORT_SCRIPT = """
+(function(){
+var ROW_H=24,OVERSCAN=30;
+function esc(v){return String(v).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/"/g,'&quot;');}
+function load(sec){
+  if(sec.rows)return;
+  var rows=[];
+  sec.el.querySelectorAll('script.chunk').forEach(function(s){var c=JSON.parse(s.textContent);for(var i=0;i<c.length;i++)rows.push(c[i]);});
+  sec.rows=rows;sec.view=rows.map(function(_,i){return i;});
+  var cols=sec.el.querySelectorAll('th');
+  sec.cols=[].map.call(cols,function(th){return th.textContent;});
+  sec.shown=[];
+  for(var c=0;c<cols.length;c++){
+    var used=rows.some(function(r){return r[c]!==null&&r[c]!=='';});
+    cols[c].style.display=used?'':'none';
+    if(used)sec.shown.push(c);
+  }
+  render(sec);
+}
+function render(sec){
+  var n=sec.view.length,sc=sec.scroller;
+  var first=Math.max(0,Math.floor(sc.scrollTop/ROW_H)-OVERSCAN);
+  var last=Math.min(n,first+Math.ceil((sc.clientHeight||480)/ROW_H)+2*OVERSCAN);
+  var out=['<tr style="height:'+(first*ROW_H)+'px"></tr>'];
+  for(var i=first;i<last;i++){
+    var r=sec.rows[sec.view[i]],cells='';
+    for(var k=0;k<sec.shown.length;k++){var v=r[sec.shown[k]];v=v===null?'':esc(v);cells+='<td title="'+v+'">'+v+'</td>';}
+    var res=r[r.length-1];
+    out.push('<tr data-i="'+sec.view[i]+'"'+(typeof res==='string'&&res.indexOf('{"error"')===0?' class="err"':'')+'>'+cells+'</tr>');
+  }
+  out.push('<tr style="height:'+((n-last)*ROW_H)+'px"></tr>');
+  sec.tbody.innerHTML=out.join('');
+  sec.count.textContent=n+' / '+sec.rows.length;
+}
+function detail(sec,i){
+  var r=sec.rows[i],o={};
+  for(var c=0;c<sec.cols.length;c++){
+    var v=r[c];if(v===null||v==='')continue;
+    if(sec.cols[c]==='details'||sec.cols[c]==='result'){try{v=JSON.parse(v);}catch(_){}}
+    o[sec.cols[c]]=v;
+  }
+  sec.detail.textContent=JSON.stringify(o,null,2);sec.detail.style.display='block';
+}
+function filter(sec,q){
+  q=q.toLowerCase();
+  if(!sec.text)sec.text=sec.rows.map(function(r){return r.join('\\u0001').toLowerCase();});
+  sec.view=[];
+  for(var i=0;i<sec.rows.length;i++)if(!q||sec.text[i].indexOf(q)>=0)sec.view.push(i);
+  if(sec.sortCol>=0)sort(sec,sec.sortCol,true);
+  sec.scroller.scrollTop=0;render(sec);
+}
+function sort(sec,c,keep){
+  if(!keep){sec.sortDir=sec.sortCol===c?-sec.sortDir:1;sec.sortCol=c;}
+  var d=sec.sortDir,rows=sec.rows;
+  sec.view.sort(function(a,b){
+    var x=rows[a][c],y=rows[b][c];
+    if(x===y)return 0;if(x===null||x==='')return 1;if(y===null||y==='')return -1;
+    if(typeof x==='number'&&typeof y==='number')return (x-y)*d;
+    return String(x).localeCompare(String(y))*d;
+  });
+}
+document.querySelectorAll('details.section').forEach(function(el){
+  var sec={el:el,rows:null,sortCol:-1,sortDir:1,scroller:el.querySelector('.scroller'),
+           tbody:el.querySelector('tbody'),count:el.querySelector('.count'),detail:el.querySelector('.detail')};
+  sec.tbody.addEventListener('click',function(e){var tr=e.target.closest('tr[data-i]');if(tr)detail(sec,+tr.getAttribute('data-i'));});
+  el.addEventListener('toggle',function(){if(el.open)load(sec);});
+  var pending=null;
+  sec.scroller.addEventListener('scroll',function(){if(sec.rows&&!pending)pending=requestAnimationFrame(function(){pending=null;render(sec);});});
+  var timer=null;
+  el.querySelector('input').addEventListener('input',function(e){clearTimeout(timer);var q=e.target.value;timer=setTimeout(function(){load(sec);filter(sec,q);},150);});
+  el.querySelectorAll('th').forEach(function(th,c){th.addEventListener('click',function(){load(sec);sort(sec,c,false);render(sec);});});
+  if(el.open)load(sec);
+});
+})();
+"""
+
+# keys a finding carries beyond the columns above, shown in the HTML "details" cell
+HTML_COLUMN_KEYS = {"name", "pid", "path", "command", "value", "state", "error", "partial"}
+
+def finding_details(item: Any) -> str:
+    if isinstance(item, Action):
+        item = item.target
+    elif isinstance(item, dict) and "action" in item and "target" in item:
+        item = item["target"]
+    if isinstance(item, Finding):
+        item = item.to_dict()
+    if not isinstance(item, dict):
+        return ""
+    rest = {k: v for k, v in item.items() if k not in HTML_COLUMN_KEYS}
+    return json.dumps(rest, ensure_ascii=False, default=to_jsonable) if rest else ""
+
+def _html_chunk(rows: List[List[Any]]) -> str:
+    # every "<" is escaped so finding text can neither close the <script> element nor open
+    # "<!--<script" and push the parser into the double-escaped state
+    data = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+    return f'<script type="application/json" class="chunk">{data}</script>\n'
+
 def save_html(report: Dict[str, Any], path: str) -> str:
-    html = ["<html><head><meta charset='utf-8'><title>System Conflict Report</title></head><body>"]
-    html.append(f"<h1>System Conflict Report</h1><p>Generated: {report.get('timestamp')}</p>")
-    html.append("<pre>")
-    html.append(json.dumps(report, indent=4, ensure_ascii=False))
-    html.append("</pre></body></html>")
+    from html import escape
+    columns = FINDING_COLUMNS[FINDING_COLUMNS.index("section") + 1:-1] + ("details", "result")
+    terms_idx = columns.index("matched_terms")
+    header = "".join(f"<th>{escape(c)}</th>" for c in columns)
+    sysinfo = report.get("system", {})
     with open(path, "w", encoding="utf-8") as f:
-        f.write("\n".join(html))
+        f.write("<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>System Conflict Report</title>\n")
+        f.write(f"<style>{HTML_REPORT_STYLE}</style></head><body>\n")
+        f.write(f"<h1>System Conflict Report</h1>\n<table class='meta' style='width:auto'>"
+                f"<tr><td>Generated</td><td>{escape(str(report.get('timestamp')))}</td></tr>"
+                f"<tr><td>System</td><td>{escape(' '.join(str(v) for v in sysinfo.values()))}</td></tr>"
+                f"<tr><td>Edge</td><td>{escape(str(report.get('edge_version')))}</td></tr></table>\n")
+        for n, section in enumerate(REPORT_SECTIONS):
+            # count the rows the chunks below hold: an error dict is one row, a partial section its marker too
+            rows = sum(1 for _ in iter_section_items(section, report.get(section)))
+            f.write(f"<details class='section'{' open' if n == 0 else ''}>"
+                    f"<summary>{escape(SECTION_TITLES.get(section, section))} (<span class='count'>"
+                    f"{rows}</span>)</summary>\n"
+                    f"<div class='tools'><input type='search' placeholder='Filter...'></div>\n"
+                    f"<div class='scroller'><table><thead><tr>{header}</tr></thead><tbody></tbody></table></div>\n"
+                    f"<pre class='detail'></pre>\n")
+            chunk: List[List[Any]] = []
+            for item in iter_section_items(section, report.get(section)):
+                row = list(flatten_finding(section, item)[1:])
+                row[terms_idx] = ";".join(row[terms_idx])
+                row.insert(-1, finding_details(item))
+                chunk.append(row)
+                if len(chunk) >= HTML_CHUNK_ROWS:
+                    f.write(_html_chunk(chunk))
+                    chunk = []
+            if chunk:
+                f.write(_html_chunk(chunk))
+            f.write("</details>\n")
+        f.write(f"<script>{HTML_REPORT_SCRIPT}</script>\n</body></html>\n")
     return path
 
 def save_md(report: Dict[str, Any], path: str) -> str:
@@ -722,7 +2285,7 @@ def save_md(report: Dict[str, Any], path: str) -> str:
     lines.append("# System Conflict Report")
     lines.append(f"**Generated:** {report.get('timestamp')}\n")
     lines.append("```json")
-    lines.append(json.dumps(report, indent=4, ensure_ascii=False))
+    lines.append(json.dumps(report, indent=4, ensure_ascii=False, default=to_jsonable))
     lines.append("```")
     with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines))
@@ -737,10 +2300,10 @@ def save_yml(report: Dict[str, Any], path: str) -> str:
     except Exception:
         with open(path, "w", encoding="utf-8") as f:
             f.write("# YAML-like dump\n")
-            f.write(json.dumps(report, indent=2, ensure_ascii=False))
+            f.write(json.dumps(report, indent=2, ensure_ascii=False, default=to_jsonable))
         return path
     with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(report, f, allow_unicode=True)
+        yaml.safe_dump(to_plain(report), f, allow_unicode=True)
     return path
 
 def save_ini(report: Dict[str, Any], path: str) -> str:
@@ -749,7 +2312,7 @@ def save_ini(report: Dict[str, Any], path: str) -> str:
     cfg["meta"] = {"generated": str(report.get("timestamp"))}
     sysinfo = report.get("system", {})
     cfg["system"] = {k: str(v) for k,v in sysinfo.items()}
-    cfg["actions"] = {"data": json.dumps(report.get("actions") or [], ensure_ascii=False)}
+    cfg["actions"] = {"data": json.dumps(report.get("actions") or [], ensure_ascii=False, default=to_jsonable)}
     with open(path, "w", encoding="utf-8") as f:
         cfg.write(f)
     return path
@@ -758,15 +2321,8 @@ def save_pdf(report: Dict[str, Any], path: str) -> str:
     try:
         from reportlab.lib.pagesizes import A4
         from reportlab.pdfgen import canvas
-    except Exception:
-        print(t("auto_install_reportlab"))
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "reportlab"])
-        except Exception as e:
-            print(t("reportlab_failed").format(err=str(e)))
-            raise
-        from reportlab.lib.pagesizes import A4
-        from reportlab.pdfgen import canvas
+    except ImportError:
+        raise ImportError("reportlab missing (pip install reportlab)")
 
     c = canvas.Canvas(path, pagesize=A4)
     width, height = A4
@@ -780,7 +2336,7 @@ def save_pdf(report: Dict[str, Any], path: str) -> str:
     for k, v in sysinfo.items():
         text.textLine(f" {k}: {v}")
     text.textLine("")
-    snippet = json.dumps(report, ensure_ascii=False, indent=2)
+    snippet = json.dumps(report, ensure_ascii=False, indent=2, default=to_jsonable)
     for line in snippet.splitlines():
         if text.getY() < 60:
             c.drawText(text)
@@ -792,6 +2348,39 @@ def save_pdf(report: Dict[str, Any], path: str) -> str:
     c.save()
     return path
 
+def save_parquet(report: Dict[str, Any], path: str) -> str:
+    try:
+        import pyarrow as pa  # type: ignore
+    except ImportError:
+        raise ImportError("pyarrow missing (pip install pyarrow)")
+    schema = pa.schema([
+        ("scan_time", pa.timestamp("us")),
+        ("host", pa.string()),
+        ("section", pa.string()),
+        ("name", pa.string()),
+        ("pid", pa.int64()),
+        ("path", pa.string()),
+        ("command", pa.string()),
+        ("state", pa.string()),
+        ("matched_terms", pa.list_(pa.string())),
+        ("action", pa.string()),
+        ("result", pa.string()),
+    ])
+    try:
+        import pyarrow.parquet as pq  # type: ignore
+        writer = pq.ParquetWriter(path, schema)
+    except ImportError:
+        # pyarrow built without Parquet support: fall back to an Arrow IPC file
+        path = os.path.splitext(path)[0] + ".arrow"
+        writer = pa.ipc.new_file(path, schema)
+    try:
+        for batch in iter_finding_batches(report):
+            columns = [list(col) for col in zip(*batch)]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+    finally:
+        writer.close()
+    return path
+
 FORMAT_SAVE_FUNCS = {
     1: (".txt", save_txt),
     2: (".json", save_json),
@@ -802,30 +2391,136 @@ FORMAT_SAVE_FUNCS = {
     7: (".log", save_log),
     8: (".yml", save_yml),
     9: (".ini", save_ini),
-    10: (".pdf", save_pdf)
+    10: (".pdf", save_pdf),
+    11: (".parquet", save_parquet)
 }
 
+# ---------------------------
+# OpenMetrics / Prometheus exposition
+# ---------------------------
+METRICS_PREFIX = "errorbroker"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+def _label_value(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def action_outcome(action: Any) -> str:
+    if isinstance(action, Action):
+        res = action.result
+    else:
+        res = action.get("result") if isinstance(action, dict) else None
+    if res is None:
+        return "skipped"
+    if isinstance(res, dict) and "ok" in res:
+        return "success" if res.get("ok") else "failure"
+    if isinstance(res, dict) and "disable" in res:
+        # sc.exe output: "[SC] ChangeServiceConfig SUCCESS"
+        return "success" if "SUCCESS" in str(res.get("disable") or "").upper() else "failure"
+    return "failure"
+
+class ScanMetrics:
+    # state is a handful of small dicts updated per scan/action; rendering walks only those series
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.scans_total = 0
+        self.last_scan_timestamp = 0.0
+        self.findings: Dict[str, int] = {}
+        self.term_findings: Dict[Tuple[str, str], int] = {}
+        self.scanner_duration: Dict[str, float] = {}
+        self.scanner_errors: Dict[Tuple[str, str], int] = {}
+        self.remediations: Dict[Tuple[str, str], int] = {}
+
+    def observe_scan(self, detections: Dict[str, Any], timings: Dict[str, Tuple[str, float]]) -> None:
+        # timings: section -> (scanner function name, seconds); sections without one were not scanned
+        counts: Dict[str, int] = {}
+        terms: Dict[Tuple[str, str], int] = {}
+        errors: List[Tuple[str, str]] = []
+        for section in REPORT_SECTIONS:
+            if section not in timings or section not in detections:
+                continue
+            val = detections[section]
+            scanner = timings[section][0]
+            if isinstance(val, dict) and val.get("error"):
+                errors.append((scanner, str(val.get("error"))))
+            items = section_items(val)
+            counts[section] = len(items)
+            for item in items:
+                for term in flatten_finding(section, item)[6]:
+                    terms[(section, term)] = terms.get((section, term), 0) + 1
+        with self._lock:
+            self.scans_total += 1
+            self.last_scan_timestamp = time.time()
+            self.findings.update(counts)
+            for key in [k for k in self.term_findings if k[0] in counts]:
+                del self.term_findings[key]
+            self.term_findings.update(terms)
+            for scanner, seconds in timings.values():
+                self.scanner_duration[scanner] = seconds
+            for key in errors:
+                self.scanner_errors[key] = self.scanner_errors.get(key, 0) + 1
+
+    def observe_action(self, action: Any) -> None:
+        name = action.action if isinstance(action, Action) else str(action.get("action"))
+        key = (name, action_outcome(action))
+        with self._lock:
+            self.remediations[key] = self.remediations.get(key, 0) + 1
+
+    def render(self, openmetrics: bool = True) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[Tuple[Dict[str, Any], Any]]) -> None:
+            full = f"{METRICS_PREFIX}_{name}"
+            sample_name = full + "_total" if kind == "counter" else full
+            # OpenMetrics declares counters without the _total suffix; the classic text format with it
+            declared = full if openmetrics or kind != "counter" else sample_name
+            lines.append(f"# TYPE {declared} {kind}")
+            lines.append(f"# HELP {declared} {help_text}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_label_value(v)}"' for k, v in labels.items())
+                lines.append(f"{sample_name}{{{label_str}}} {value}" if label_str else f"{sample_name} {value}")
+
+        with self._lock:
+            family("scans", "counter", "Completed scans.", [({}, self.scans_total)])
+            family("last_scan_timestamp_seconds", "gauge", "Unix time of the latest scan.",
+                   [({}, round(self.last_scan_timestamp, 3))])
+            family("findings", "gauge", "Findings in the latest scan, per section.",
+                   [({"section": s}, n) for s, n in sorted(self.findings.items())])
+            family("term_findings", "gauge", "Findings in the latest scan, per section and matched term.",
+                   [({"section": s, "term": tm}, n) for (s, tm), n in sorted(self.term_findings.items())])
+            family("scanner_duration_seconds", "gauge", "Duration of each scanner in the latest scan.",
+                   [({"scanner": s}, round(d, 6)) for s, d in sorted(self.scanner_duration.items())])
+            family("scanner_errors", "counter", "Scanner runs that returned an error result.",
+                   [({"scanner": s, "error": e}, n) for (s, e), n in sorted(self.scanner_errors.items())])
+            family("remediations", "counter", "Remediation actions by outcome.",
+                   [({"action": a, "outcome": o}, n) for (a, o), n in sorted(self.remediations.items())])
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> str:
+        # node_exporter textfile collector: write aside, then rename so scrapes never see a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render(openmetrics=False))
+        os.replace(tmp, path)
+        return path
+
+METRICS = ScanMetrics()
+
 # ---------------------------
 # Main interactive flow
 # ---------------------------
-def main_flow():
+def main_flow(offline_root: Optional[str] = None, metrics_textfile: Optional[str] = None):
     print(t("scanning"))
-    detections = {
-        "timestamp": datetime.now().isoformat(),
-        "system": {
-            "os": platform.system(),
-            "release": platform.release(),
-            "platform": platform.platform()
-        },
-        "edge_version": get_edge_product_version(),
-        "process_conflicts": scan_running_processes(),
-        "startup_conflicts": scan_win32_startupcommand(),
-        "hkcu_conflicts": scan_hkcu_run_values(),
-        "service_conflicts": scan_windows_services()
-    }
+    if offline_root:
+        detections = collect_offline_detections(offline_root)
+    else:
+        detections = collect_detections()
 
     print(t("results_short"))
     def count_or_message(x: Any) -> str:
+        if is_partial(x):
+            return f"{len(section_items(x))} ({x.get('error')}, partial)"
         if isinstance(x, dict) and x.get("error"):
             return f"Ошибка: {x.get('error')}"
         if isinstance(x, list):
@@ -836,77 +2531,90 @@ def main_flow():
     print(f"  {t('startup')}: {count_or_message(detections['startup_conflicts'])}")
     print(f"  {t('hkcu')}: {count_or_message(detections['hkcu_conflicts'])}")
     print(f"  {t('services')}: {count_or_message(detections['service_conflicts'])}")
+    print(f"  {t('tasks')}: {count_or_message(detections['scheduled_task_conflicts'])}")
 
-    ans = prompt_choice_localized(t("interactive_prompt"), {"y": t("yes"), "n": t("no")})
-    actions = []
+    # remediation acts on the live machine, so it is never offered for an offline image
+    ans = "n" if offline_root else prompt_choice_localized(t("interactive_prompt"), {"y": t("yes"), "n": t("no")})
+    actions: List[Action] = []
     if ans == "y":
         pc = detections.get("process_conflicts") or []
-        if isinstance(pc, dict) and pc.get("error"):
+        if isinstance(pc, dict) and pc.get("error") and not is_partial(pc):
             print("Process scan:", pc)
         else:
-            for proc in pc:
-                name = proc.get("name"); pid = proc.get("pid"); path = proc.get("path")
+            for proc in section_items(pc, actionable=True):
+                name = proc.name; pid = proc.pid; path = proc.path
                 print(f"\n{name} (PID {pid})\n  {path}")
                 ch = prompt_choice_localized(t("action_prompt"), {"k": t("kill"), "s": t("skip"), "a": t("alternatives")})
                 if ch == "k":
                     res = kill_process_by_pid(pid)
-                    actions.append({"action": "kill_process", "target": proc, "result": res})
+                    actions.append(Action("kill_process", proc, res))
                     print("Result:", res)
                 else:
-                    actions.append({"action": "skip_process", "target": proc})
+                    actions.append(Action("skip_process", proc))
 
-        ac = detections.get("startup_conflicts") or []
+        ac = section_items(detections.get("startup_conflicts"), actionable=True)
         for e in ac:
-            name = e.get("name"); cmd = e.get("command")
+            name = e.name; cmd = e.command
             print(f"\n{name}\n  {cmd}")
             ch = prompt_choice_localized(t("action_prompt"), {"i": t("check_hkcu"), "s": t("skip"), "a": t("alternatives")})
             if ch == "i":
-                hk = detections.get("hkcu_conflicts") or []
-                found = next((r for r in hk if r.get("name") == name), None)
+                hk = section_items(detections.get("hkcu_conflicts"), actionable=True)
+                found = next((r for r in hk if r.name == name), None)
                 if found:
                     sub = prompt_choice_localized(t("remove_prompt"), {"y": t("yes"), "n": t("no")})
                     if sub == "y":
-                        res = delete_hkcu_run_value(found.get("name"))
-                        actions.append({"action": "delete_hkcu", "target": found, "result": res})
+                        res = delete_hkcu_run_value(found.name)
+                        actions.append(Action("delete_hkcu", found, res))
                 else:
-                    actions.append({"action": "manual_review", "target": e})
+                    actions.append(Action("manual_review", e))
             else:
-                actions.append({"action": "skip_autostart", "target": e})
+                actions.append(Action("skip_autostart", e))
 
-        rc = detections.get("hkcu_conflicts") or []
+        rc = section_items(detections.get("hkcu_conflicts"), actionable=True)
         for r in rc:
-            name = r.get("name"); val = r.get("value")
+            name = r.name; val = r.command
             print(f"\n{name}\n  {val}")
             ch = prompt_choice_localized(t("remove_prompt"), {"y": t("yes"), "n": t("no")})
             if ch == "y":
                 res = delete_hkcu_run_value(name)
-                actions.append({"action": "delete_hkcu", "target": r, "result": res})
+                actions.append(Action("delete_hkcu", r, res))
             else:
-                actions.append({"action": "skip_registry", "target": r})
+                actions.append(Action("skip_registry", r))
 
-        sc = detections.get("service_conflicts") or []
+        sc = section_items(detections.get("service_conflicts"), actionable=True)
         for s in sc:
-            name = s.get("name"); disp = s.get("display_name"); state = s.get("state")
+            name = s.name; disp = s.display_name; state = s.state
             print(f"\n{name} ({disp}) state={state}")
             ch = prompt_choice_localized(t("action_prompt"), {"d": t("stop_disable"), "s": t("skip_label")})
             if ch == "d":
                 res = stop_and_disable_service_by_name(name)
-                actions.append({"action": "stop_disable_service", "target": s, "result": res})
+                actions.append(Action("stop_disable_service", s, res))
             else:
-                actions.append({"action": "skip_service", "target": s})
+                actions.append(Action("skip_service", s))
+
+        tc = section_items(detections.get("scheduled_task_conflicts"), actionable=True)
+        for task in tc:
+            name = task.name; cmd = task.command; state = task.state
+            print(f"\n{name} state={state}\n  {cmd}")
+            ch = prompt_choice_localized(t("action_prompt"), {"d": t("disable_task"), "s": t("skip_label")})
+            if ch == "d":
+                res = disable_scheduled_task(name)
+                actions.append(Action("disable_scheduled_task", task, res))
+            else:
+                actions.append(Action("skip_scheduled_task", task))
     else:
         print(t("done"))
 
-    report = {
-        "timestamp": detections["timestamp"],
-        "system": detections["system"],
-        "edge_version": detections["edge_version"],
-        "process_conflicts": detections["process_conflicts"],
-        "startup_conflicts": detections["startup_conflicts"],
-        "hkcu_conflicts": detections["hkcu_conflicts"],
-        "service_conflicts": detections["service_conflicts"],
-        "actions": actions
-    }
+    # the report is the detections themselves plus the actions taken; nothing is copied
+    report = detections
+    report["actions"] = actions
+    for action in actions:
+        METRICS.observe_action(action)
+    if metrics_textfile:
+        try:
+            METRICS.write_textfile(metrics_textfile)
+        except OSError as e:
+            print(t("failed_save").format(ext=".prom", err=str(e)))
 
     print()
     print(t("choose_report_formats"))
@@ -919,7 +2627,7 @@ def main_flow():
             continue
         if token.isdigit():
             idx = int(token)
-            if 1 <= idx <= 10:
+            if idx in FORMAT_SAVE_FUNCS:
                 selected_indices.append(idx)
     if not selected_indices:
         selected_indices = [1, 2]
@@ -948,10 +2656,286 @@ def main_flow():
     except Exception:
         pass
 
+# ---------------------------
+# Resident scan agent (JSON-RPC over localhost HTTP)
+# ---------------------------
+AGENT_HOST = "127.0.0.1"
+AGENT_PORT = int(os.environ.get("ERRORBROKER_AGENT_PORT", "8765"))
+# cached scan results younger than this are served without rescanning
+AGENT_MAX_AGE_SECONDS = float(os.environ.get("ERRORBROKER_AGENT_MAX_AGE", "60"))
+# shared secret clients send as "Authorization: Bearer <token>"; generated at start when
+# remediation is enabled without one
+AGENT_TOKEN = os.environ.get("ERRORBROKER_AGENT_TOKEN", "")
+# a rebound DNS name shows up in Host, so only loopback names are answered
+AGENT_ALLOWED_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+AGENT_MAX_BODY_BYTES = 1 << 20
+
+# section -> (action name, remediation function taking the finding)
+REMEDIATIONS = {
+    "process_conflicts": ("kill_process", kill_scanned_process),
+    "hkcu_conflicts": ("delete_hkcu", lambda f: delete_hkcu_run_value(f.name)),
+    "service_conflicts": ("stop_disable_service", lambda f: stop_and_disable_service_by_name(f.name)),
+    "scheduled_task_conflicts": ("disable_scheduled_task", lambda f: disable_scheduled_task(f.name))
+}
+
+class AgentError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class ScanAgent:
+    # keeps the latest report in memory; concurrent scan requests share a single in-flight scan
+    def __init__(self, scan_func: Any = None, max_age: float = AGENT_MAX_AGE_SECONDS,
+                 allow_remediate: bool = False, token: str = ""):
+        self.scan_func = scan_func or collect_detections
+        self.max_age = max_age
+        self.allow_remediate = allow_remediate
+        self.token = token
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+        self._report: Optional[Dict[str, Any]] = None
+        self._report_json: Optional[str] = None
+        self._scanned_at = 0.0
+        self._scan_error: Optional[str] = None
+
+    def _fresh(self, max_age: float) -> bool:
+        return self._report is not None and time.monotonic() - self._scanned_at <= max_age
+
+    def scan(self, max_age: Optional[float] = None, force: bool = False) -> str:
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            if not force and self._fresh(max_age):
+                return self._report_json
+            leader = self._inflight is None
+            if leader:
+                self._inflight = threading.Event()
+            done = self._inflight
+        if not leader:
+            done.wait()
+            with self._lock:
+                if self._report_json is None:
+                    raise AgentError(-32000, self._scan_error or "scan failed")
+                return self._report_json
+        try:
+            report = self.scan_func()
+            report.setdefault("actions", [])
+            error = None
+        except Exception as e:
+            report, error = None, str(e)
+        with self._lock:
+            if report is not None:
+                self._report = report
+                self._report_json = json.dumps(report, ensure_ascii=False, default=to_jsonable)
+                self._scanned_at = time.monotonic()
+            self._scan_error = error
+            self._inflight = None
+            done.set()
+            if report is None:
+                raise AgentError(-32000, f"scan failed: {error}")
+            return self._report_json
+
+    def last_report(self) -> str:
+        with self._lock:
+            if self._report_json is None:
+                return "null"
+            return self._report_json
+
+    def remediate(self, section: str, name: str, pid: Optional[int] = None) -> str:
+        if not self.allow_remediate:
+            raise AgentError(-32001, "remediation is disabled (start the agent with --allow-remediate)")
+        if section not in REMEDIATIONS:
+            raise AgentError(-32602, f"section {section!r} cannot be remediated")
+        with self._lock:
+            report = self._report
+        if report is None:
+            raise AgentError(-32002, "no scan results yet; call scan first")
+        target = next((f for f in section_items(report.get(section), actionable=True)
+                       if f.name == name and (pid is None or f.pid == pid)), None)
+        if target is None:
+            raise AgentError(-32602, f"no {section} finding named {name!r}")
+        action_name, func = REMEDIATIONS[section]
+        action = Action(action_name, target, func(target))
+        METRICS.observe_action(action)
+        with self._lock:
+            report["actions"].append(action)
+            self._report_json = json.dumps(report, ensure_ascii=False, default=to_jsonable)
+        return json.dumps(action, ensure_ascii=False, default=to_jsonable)
+
+    def dispatch(self, method: str, params: Any) -> str:
+        params = params or {}
+        if not isinstance(params, dict):
+            raise AgentError(-32602, "params must be an object")
+        try:
+            if method == "scan":
+                return self.scan(max_age=params.get("max_age"), force=bool(params.get("force")))
+            if method == "last_report":
+                return self.last_report()
+            if method == "remediate":
+                return self.remediate(params["section"], params["name"], params.get("pid"))
+        except (KeyError, TypeError) as e:
+            raise AgentError(-32602, f"invalid params: {e}")
+        raise AgentError(-32601, f"method not found: {method}")
+
+    def handle_rpc(self, body: bytes) -> str:
+        try:
+            request = json.loads(body)
+        except (ValueError, UnicodeDecodeError):
+            return '{"jsonrpc": "2.0", "id": null, "error": {"code": -32700, "message": "parse error"}}'
+        req_id = json.dumps(request.get("id") if isinstance(request, dict) else None)
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            error = {"code": -32600, "message": "invalid request"}
+            return f'{{"jsonrpc": "2.0", "id": {req_id}, "error": {json.dumps(error)}}}'
+        try:
+            result = self.dispatch(request["method"], request.get("params"))
+        except AgentError as e:
+            error = {"code": e.code, "message": e.message}
+            return f'{{"jsonrpc": "2.0", "id": {req_id}, "error": {json.dumps(error, ensure_ascii=False)}}}'
+        except Exception as e:
+            error = {"code": -32603, "message": f"internal error: {e}"}
+            return f'{{"jsonrpc": "2.0", "id": {req_id}, "error": {json.dumps(error, ensure_ascii=False)}}}'
+        # result is already serialized JSON; splice it in rather than re-encoding the report
+        return f'{{"jsonrpc": "2.0", "id": {req_id}, "result": {result}}}'
+
+class _AgentRequestHandler(BaseHTTPRequestHandler):
+    agent: ScanAgent = None  # type: ignore
+
+    def _send(self, status: int, body: str, content_type: str = "application/json") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _refused(self) -> Optional[Tuple[int, str]]:
+        # browsers send Origin on every cross-site POST, and any page can reach 127.0.0.1
+        if self.headers.get("Origin") is not None:
+            return 403, "cross-origin requests are not allowed"
+        host = (self.headers.get("Host") or "").strip().lower()
+        host = host[:host.find("]") + 1] if host.startswith("[") else host.split(":", 1)[0]
+        if host not in AGENT_ALLOWED_HOSTS:
+            return 403, "unexpected Host header"
+        if self.agent.token:
+            sent = (self.headers.get("Authorization") or "").encode("utf-8", errors="replace")
+            if not hmac.compare_digest(sent, f"Bearer {self.agent.token}".encode("utf-8")):
+                return 401, "missing or invalid token"
+        return None
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}))
+
+    def do_POST(self) -> None:
+        refused = self._refused()
+        if refused:
+            self._send_error(*refused)
+            return
+        # a CORS "simple" request cannot carry application/json without a preflight
+        content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self._send_error(415, "Content-Type must be application/json")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or "")
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_error(411, "a valid Content-Length is required")
+            return
+        if length > AGENT_MAX_BODY_BYTES:
+            self._send_error(413, "request body too large")
+            return
+        self._send(200, self.agent.handle_rpc(self.rfile.read(length)))
+
+    def do_GET(self) -> None:
+        refused = self._refused()
+        if refused:
+            self._send_error(*refused)
+            return
+        if self.path in ("/", "/last_report"):
+            self._send(200, self.agent.last_report())
+        elif self.path == "/metrics":
+            body = METRICS.render()
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send(404, '{"error": "not found"}')
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+def serve_agent(agent: ScanAgent, host: str = AGENT_HOST, port: int = AGENT_PORT) -> ThreadingHTTPServer:
+    handler = type("AgentRequestHandler", (_AgentRequestHandler,), {"agent": agent})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="errorbroker-agent", daemon=True).start()
+    return server
+
+def run_agent(port: int = AGENT_PORT, max_age: float = AGENT_MAX_AGE_SECONDS, allow_remediate: bool = False,
+              metrics_textfile: Optional[str] = None, token: str = AGENT_TOKEN) -> None:
+    if allow_remediate and not token:
+        token = secrets.token_urlsafe(24)
+        print(f"Agent token (send as 'Authorization: Bearer <token>'): {token}")
+    agent = ScanAgent(max_age=max_age, allow_remediate=allow_remediate, token=token)
+    server = serve_agent(agent, port=port)
+    print(f"ErrorBroker agent listening on http://{AGENT_HOST}:{server.server_address[1]}/ (JSON-RPC)")
+    try:
+        # keep the cache warm so queries are answered from memory
+        while True:
+            try:
+                agent.scan()
+            except AgentError as e:
+                print(f"scan failed: {e.message}")
+            if metrics_textfile:
+                try:
+                    METRICS.write_textfile(metrics_textfile)
+                except OSError as e:
+                    print(f"metrics textfile failed: {e}")
+            time.sleep(max(1.0, max_age / 2))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
 # ---------------------------
 # Run
 # ---------------------------
 if __name__ == "__main__":
-    ok = ensure_psutil()
-    # continue even if psutil installation failed (scans will show errors)
-    main_flow()
+    parser = argparse.ArgumentParser(description="Windows conflict scanner and fixer")
+    parser.add_argument("--offline", metavar="IMAGE_ROOT",
+                        help="scan a mounted offline Windows image (registry hives) instead of the live system")
+    parser.add_argument("--agent", action="store_true",
+                        help="run as a resident agent answering scan/last_report/remediate over localhost JSON-RPC")
+    parser.add_argument("--port", type=int, default=AGENT_PORT, help="agent port on 127.0.0.1")
+    parser.add_argument("--max-age", type=float, default=AGENT_MAX_AGE_SECONDS,
+                        help="agent cache freshness limit in seconds")
+    parser.add_argument("--allow-remediate", action="store_true", help="let agent clients call remediate")
+    parser.add_argument("--metrics-textfile", metavar="PATH",
+                        help="write OpenMetrics/Prometheus scan statistics here (node_exporter textfile collector)")
+    parser.add_argument("--record", metavar="CAPTURE",
+                        help="record every PowerShell call, the process table and files read into a .json.gz capture")
+    parser.add_argument("--replay", metavar="CAPTURE",
+                        help="replay a capture through the scanners and report writers (no subprocesses, any OS)")
+    args = parser.parse_args()
+    if args.record and (args.agent or args.replay or args.offline):
+        # the agent rescans forever; one capture holds exactly one live scan
+        parser.error("--record records a single live scan and cannot be combined with --agent, --replay or --offline")
+    if args.replay:
+        start_replay(load_capture(args.replay))
+    elif args.record:
+        start_recording()
+    # replay starts no subprocesses, so it never installs anything; psutil is only needed live
+    if not args.replay:
+        bootstrap_dependencies([m for m in OPTIONAL_DEPENDENCIES if m != "psutil" or not args.offline])
+    # continue even if an installation failed (scans and writers report what is missing)
+    if args.agent:
+        run_agent(port=args.port, max_age=args.max_age, allow_remediate=args.allow_remediate,
+                  metrics_textfile=args.metrics_textfile)
+    else:
+        main_flow(offline_root=args.offline, metrics_textfile=args.metrics_textfile)
+    if RECORDING is not None:
+        print(f"Capture: {save_capture(RECORDING, args.record)}")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# ErrorBroker asks for a language at import time unless one is preselected
+os.environ.setdefault("ERRORBROKER_LANG", "en")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,85 @@
+import http.client
+import json
+import subprocess
+import sys
+
+import pytest
+
+import ErrorBroker as eb
+
+
+def fake_scan():
+    return {"timestamp": "2026-01-01T00:00:00", "system": {"host": "test"},
+            "hkcu_conflicts": [eb.Finding("hkcu_conflicts", name="SteamRun", command="steam.exe")]}
+
+
+@pytest.fixture
+def agent_port():
+    agent = eb.ScanAgent(scan_func=fake_scan, allow_remediate=True, token="s3cret")
+    server = eb.serve_agent(agent, port=0)
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def request(port, method="POST", path="/", body=b'{"jsonrpc": "2.0", "id": 1, "method": "scan"}', **headers):
+    headers = {"Host": f"127.0.0.1:{port}", "Content-Type": "application/json",
+               "Authorization": "Bearer s3cret", **headers}
+    headers = {k.replace("_", "-"): v for k, v in headers.items() if v is not None}
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.putrequest(method, path, skip_host=True, skip_accept_encoding=True)
+    for key, value in headers.items():
+        conn.putheader(key, value)
+    if "Content-Length" not in headers:
+        conn.putheader("Content-Length", str(len(body)))
+    conn.endheaders(body)
+    resp = conn.getresponse()
+    status, data = resp.status, resp.read()
+    conn.close()
+    return status, data
+
+
+def test_valid_request_is_answered(agent_port):
+    status, data = request(agent_port)
+    assert status == 200
+    assert json.loads(data)["result"]["hkcu_conflicts"][0]["name"] == "SteamRun"
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Content_Type": "text/plain"}, 415),
+    ({"Origin": "https://evil.example"}, 403),
+    ({"Host": "evil.example:8765"}, 403),
+    ({"Authorization": None}, 401),
+    ({"Authorization": "Bearer wrong"}, 401),
+    ({"Content_Length": "-1"}, 411),
+    ({"Content_Length": "garbage"}, 411),
+    ({"Content_Length": str(eb.AGENT_MAX_BODY_BYTES + 1)}, 413),
+])
+def test_untrusted_requests_are_refused(agent_port, headers, expected):
+    status, _ = request(agent_port, **headers)
+    assert status == expected
+
+
+def test_get_checks_host_and_token(agent_port):
+    assert request(agent_port, "GET", "/last_report", b"")[0] == 200
+    assert request(agent_port, "GET", "/metrics", b"", Host="rebound.example")[0] == 403
+    assert request(agent_port, "GET", "/metrics", b"", Authorization=None)[0] == 401
+
+
+def test_kill_refuses_a_reused_pid():
+    psutil = pytest.importorskip("psutil")
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        name = psutil.Process(child.pid).name()
+        other = eb.Finding("process_conflicts", name="obs64.exe", pid=child.pid)
+        assert eb.kill_scanned_process(other)["ok"] is False
+        stale = eb.Finding("process_conflicts", name=name, pid=child.pid,
+                           extra={"create_time": "2000-01-01T00:00:00"})
+        assert eb.kill_scanned_process(stale)["ok"] is False
+        assert child.poll() is None
+        live = eb.Finding("process_conflicts", name=name, pid=child.pid)
+        eb.enrich_processes([live], 5)
+        assert eb.kill_scanned_process(live)["ok"] is True
+    finally:
+        child.kill()
+        child.wait()
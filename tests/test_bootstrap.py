@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+import ErrorBroker as eb
+
+
+@pytest.fixture
+def pip(monkeypatch, tmp_path):
+    # fake pip: records each call, installs nothing; missing_dependencies reports what is still absent
+    calls = []
+    installed = set()
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    monkeypatch.setattr(eb, "WHEELHOUSE_DIR", str(wheelhouse))
+    monkeypatch.setattr(eb, "DEPENDENCY_INDEX_URL", "")
+    monkeypatch.setattr(eb, "_activate_installed", lambda: None)
+    monkeypatch.setattr(eb, "missing_dependencies", lambda modules=None: [m for m in modules if m not in installed])
+
+    def fake(packages, source_args, timeout):
+        calls.append(("wheelhouse" if "--no-index" in source_args else "index", tuple(packages), timeout))
+        return 1, "No matching distribution found"
+
+    monkeypatch.setattr(eb, "_pip_install", fake)
+    return calls
+
+
+def test_only_the_wheelhouse_is_retried_per_package(pip):
+    results = eb.install_dependencies(["psutil", "yaml"])
+    assert [(src, pkgs) for src, pkgs, _ in pip] == [
+        ("wheelhouse", ("psutil", "PyYAML")),
+        ("wheelhouse", ("psutil",)),
+        ("wheelhouse", ("PyYAML",)),
+        ("index", ("psutil", "PyYAML")),
+    ]
+    assert results == {"psutil": "No matching distribution found", "yaml": "No matching distribution found"}
+
+
+def test_every_pip_call_shares_one_deadline(pip):
+    eb.install_dependencies(["psutil", "yaml"], timeout=30)
+    timeouts = [t for _, _, t in pip]
+    assert all(0 < t <= 30 for t in timeouts)
+    assert timeouts == sorted(timeouts, reverse=True)
+
+
+def test_exhausted_deadline_stops_the_bootstrap(pip, monkeypatch):
+    slow = eb._pip_install
+
+    def slow_pip(packages, source_args, timeout):
+        time.sleep(0.1)
+        return slow(packages, source_args, timeout)
+
+    monkeypatch.setattr(eb, "_pip_install", slow_pip)
+    results = eb.install_dependencies(["psutil", "yaml"], timeout=0.05)
+    assert len(pip) == 1
+    assert results == {"psutil": "dependency bootstrap exceeded 0.05s", "yaml": "dependency bootstrap exceeded 0.05s"}
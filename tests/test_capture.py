@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import ErrorBroker as eb
+
+
+def plain(report):
+    return json.dumps({k: v for k, v in report.items() if k != "timestamp"}, default=eb.to_jsonable, sort_keys=True)
+
+
+@pytest.fixture
+def scanners(monkeypatch, tmp_path):
+    tasks = tmp_path / "Tasks"
+    tasks.mkdir()
+    (tasks / "Discord").write_text(
+        '<Task xmlns="http://schemas.microsoft.com/windows/2004/02/mit/task">'
+        '<Actions><Exec><Command>C:\\discord.exe</Command></Exec></Actions></Task>', encoding="utf-8")
+    monkeypatch.setattr(eb, "TASKS_DIR", str(tasks))
+    monkeypatch.setattr(eb, "_powershell_run", lambda cmd, timeout=None: ('{"SteamRun": "C:\\\\steam.exe"}', "", 0))
+    monkeypatch.setitem(sys.modules, "psutil", None)  # import psutil -> ImportError
+    yield tmp_path
+    eb.stop_capture()
+
+
+def test_replay_reproduces_the_recorded_report(scanners):
+    eb.start_recording()
+    live = eb.collect_detections(30)
+    path = eb.save_capture(eb.RECORDING, str(scanners / "scan.json.gz"))
+    eb.stop_capture()
+    assert live["process_conflicts"] == {"error": "psutil missing", "hint": "pip install psutil"}
+
+    (scanners / "Tasks" / "Discord").unlink()
+    eb.start_replay(eb.load_capture(path))
+    assert plain(eb.collect_detections(30)) == plain(live)
+
+
+def test_replay_starts_no_subprocess(scanners, monkeypatch):
+    eb.start_recording()
+    eb.collect_detections(30)
+    capture = eb.ScanCapture(json.loads(json.dumps(eb.RECORDING.to_dict())))
+    eb.stop_capture()
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("subprocess started during replay")
+
+    monkeypatch.setattr(subprocess, "Popen", forbidden)
+    monkeypatch.setattr(subprocess, "run", forbidden)
+    eb.start_replay(capture)
+    report = eb.collect_detections(30)
+    hkcu = eb.section_items(report["hkcu_conflicts"], actionable=True)
+    assert eb.delete_hkcu_run_value(hkcu[0].name)["message"].startswith("replay:")
@@ -0,0 +1,68 @@
+import csv
+import json
+from datetime import datetime
+
+import ErrorBroker as eb
+
+
+def report():
+    steam = eb.Finding("process_conflicts", name="steam.exe", pid=42, path="C:\\Steam\\steam.exe")
+    obs = eb.Finding("process_conflicts", name="obs64.exe", pid=7, path="C:\\OBS\\obs64.exe")
+    return {
+        "timestamp": "2026-10-19T08:30:00",
+        "system": {"host": "WS-042", "os": "Windows"},
+        "process_conflicts": eb.timeout_result([steam, obs], "budget exhausted"),
+        "service_conflicts": {"error": "Services fetch failed", "details": "access denied"},
+        "startup_conflicts": [eb.Finding("startup_conflicts", raw="Discord  C:\\Discord\\Update.exe")],
+        "actions": [eb.Action("kill", steam, {"error": "access denied"})],
+    }
+
+
+def read_rows(tmp_path):
+    path = eb.save_csv(report(), str(tmp_path / "report.csv"))
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_header_and_scan_key_columns(tmp_path):
+    rows = read_rows(tmp_path)
+    assert tuple(rows[0]) == eb.FINDING_COLUMNS
+    body = [dict(zip(eb.FINDING_COLUMNS, r)) for r in rows[1:]]
+    assert body
+    assert {(r["scan_time"], r["host"]) for r in body} == {("2026-10-19T08:30:00", "WS-042")}
+    assert datetime.fromisoformat(body[0]["scan_time"]) == datetime(2026, 10, 19, 8, 30)
+
+
+def test_rows_per_section(tmp_path):
+    body = [dict(zip(eb.FINDING_COLUMNS, r)) for r in read_rows(tmp_path)[1:]]
+    by_section = {}
+    for r in body:
+        by_section.setdefault(r["section"], []).append(r)
+
+    # partial section: the timeout marker row, then every salvaged finding
+    marker, steam, obs = by_section["process_conflicts"]
+    assert json.loads(marker["result"]) == {"error": "timeout", "partial": True, "details": "budget exhausted"}
+    assert (steam["name"], steam["pid"], steam["matched_terms"]) == ("steam.exe", "42", "steam")
+    assert (obs["name"], obs["matched_terms"]) == ("obs64.exe", "obs")
+
+    [services] = by_section["service_conflicts"]
+    assert json.loads(services["result"]) == {"error": "Services fetch failed", "details": "access denied"}
+    assert services["name"] == ""
+
+    [fallback] = by_section["startup_conflicts"]
+    assert fallback["command"] == "Discord  C:\\Discord\\Update.exe"
+    assert fallback["matched_terms"] == "discord"
+
+    [action] = by_section["actions"]
+    assert (action["action"], action["name"], action["pid"]) == ("kill", "steam.exe", "42")
+    assert json.loads(action["result"]) == {"error": "access denied"}
+
+
+def test_multiple_terms_are_semicolon_joined(tmp_path):
+    rep = {"timestamp": "2026-10-19T08:30:00", "system": {"host": "WS-042"},
+           "startup_conflicts": [eb.Finding("startup_conflicts", name="OBS hotkey",
+                                            command="C:\\obs\\hotkey-macro.exe")]}
+    path = eb.save_csv(rep, str(tmp_path / "r.csv"))
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["matched_terms"] == "hotkey;obs;macro"
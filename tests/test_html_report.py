@@ -0,0 +1,49 @@
+import json
+import re
+
+import ErrorBroker as eb
+
+CHUNK = re.compile(r'<script type="application/json" class="chunk">(.*?)</script>', re.S)
+SECTION = re.compile(r"<details class='section'.*?</details>", re.S)
+
+
+def report():
+    evil = eb.Finding("startup_conflicts", name="</script><script>alert(1)</script>",
+                      command="<!--<script steam.exe", source="C:\\<Startup>")
+    return {
+        "timestamp": "2026-10-19T08:30:00",
+        "system": {"host": "WS-042"},
+        "process_conflicts": eb.timeout_result([eb.Finding("process_conflicts", name="obs64.exe", pid=7, path="")]),
+        "startup_conflicts": [evil, eb.Finding("startup_conflicts", raw="Discord </script> line")],
+        "hkcu_conflicts": [],
+        "service_conflicts": {"error": "Services fetch failed", "details": "<b>denied</b>"},
+        "scheduled_task_conflicts": [],
+    }
+
+
+def render(tmp_path):
+    path = eb.save_html(report(), str(tmp_path / "report.html"))
+    return open(path, encoding="utf-8").read()
+
+
+def test_no_raw_angle_bracket_inside_data_chunks(tmp_path):
+    html = render(tmp_path)
+    chunks = CHUNK.findall(html)
+    assert chunks
+    for data in chunks:
+        assert "<" not in data
+    # rows decode back to the original text: marker, obs64.exe, then the startup entry
+    name, pid, path, command, *_, details, result = [row for data in chunks for row in json.loads(data)][2]
+    assert (name, command) == ("</script><script>alert(1)</script>", "<!--<script steam.exe")
+    assert json.loads(details) == {"source": "C:\\<Startup>"}
+
+
+def test_summary_counts_rows_written(tmp_path):
+    counts = {}
+    for block in SECTION.findall(render(tmp_path)):
+        written = sum(len(json.loads(data)) for data in CHUNK.findall(block))
+        shown = int(re.search(r"<span class='count'>(\d+)</span>", block).group(1))
+        assert shown == written
+        counts[re.search(r"<summary>(.*?) \(", block).group(1)] = shown
+    assert counts == {"Process findings": 2, "Startup entries": 2, "HKCU Run values": 0,
+                      "Service findings": 1, "Scheduled tasks": 0, "Actions performed": 0}
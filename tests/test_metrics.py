@@ -0,0 +1,78 @@
+import ErrorBroker as eb
+
+from test_offline_hive import image  # noqa: F401  (fixture: tmp offline image)
+
+
+def scanned_metrics():
+    metrics = eb.ScanMetrics()
+    detections = {
+        "process_conflicts": [eb.Finding("process_conflicts", name="obs64.exe", pid=7, path="C:\\obs\\obs64.exe")],
+        "startup_conflicts": eb.timeout_result([eb.Finding("startup_conflicts", name='say "hi"\\n', command="steam.exe")]),
+        "hkcu_conflicts": [],
+        "service_conflicts": {"error": "Services fetch failed", "details": "denied"},
+        "scheduled_task_conflicts": [],
+    }
+    timings = {key: (scanner.__name__, 0.25) for key, scanner in eb.SCANNERS}
+    metrics.observe_scan(detections, timings)
+    ok = {"stop": "[SC] ControlService SUCCESS", "disable": "[SC] ChangeServiceConfig SUCCESS"}
+    metrics.observe_action(eb.Action("stop_disable_service", {"name": "SteamService"}, ok))
+    return metrics
+
+
+def samples(text):
+    return [ln for ln in text.splitlines() if ln and not ln.startswith("#")]
+
+
+def test_openmetrics_counters_declared_without_total():
+    text = scanned_metrics().render(openmetrics=True)
+    assert text.endswith("# EOF\n")
+    assert "# TYPE errorbroker_scans counter" in text
+    assert "# TYPE errorbroker_remediations counter" in text
+    assert "errorbroker_scans_total 1" in samples(text)
+    assert 'errorbroker_remediations_total{action="stop_disable_service",outcome="success"} 1' in samples(text)
+
+
+def test_classic_text_format_declares_total_and_has_no_eof(tmp_path):
+    path = scanned_metrics().write_textfile(str(tmp_path / "errorbroker.prom"))
+    text = open(path, encoding="utf-8").read()
+    assert "# EOF" not in text
+    assert "# TYPE errorbroker_scans_total counter" in text
+    assert "# TYPE errorbroker_scanner_errors_total counter" in text
+    assert 'errorbroker_scanner_errors_total{scanner="scan_windows_services",error="Services fetch failed"} 1' in text
+    assert "# TYPE errorbroker_findings gauge" in text
+
+
+def test_label_values_are_escaped():
+    metrics = eb.ScanMetrics()
+    metrics.observe_scan({"startup_conflicts": {"error": 'bad "quote"\\path\nline'}},
+                         {"startup_conflicts": ("scan_startup_folders", 0.1)})
+    text = metrics.render()
+    assert ('errorbroker_scanner_errors_total{scanner="scan_startup_folders",'
+            'error="bad \\"quote\\"\\\\path\\nline"} 1') in samples(text)
+
+
+def test_per_term_and_duration_series():
+    text = scanned_metrics().render()
+    assert 'errorbroker_term_findings{section="process_conflicts",term="obs"} 1' in text
+    assert 'errorbroker_term_findings{section="startup_conflicts",term="steam"} 1' in text
+    assert 'errorbroker_scanner_duration_seconds{scanner="scan_windows_services"} 0.25' in text
+
+
+def test_action_outcome_for_sc_results():
+    done = {"stop": "", "disable": "[SC] ChangeServiceConfig SUCCESS"}
+    failed = {"stop": "[SC] OpenService FAILED 5: Access is denied.", "disable": "[SC] OpenService FAILED 5"}
+    assert eb.action_outcome(eb.Action("stop_disable_service", {}, done)) == "success"
+    assert eb.action_outcome(eb.Action("stop_disable_service", {}, failed)) == "failure"
+    assert eb.action_outcome(eb.Action("kill", {}, {"ok": True})) == "success"
+    assert eb.action_outcome(eb.Action("skip_service", {})) == "skipped"
+
+
+def test_offline_scan_times_real_scanners(image, monkeypatch):
+    metrics = eb.ScanMetrics()
+    monkeypatch.setattr(eb, "METRICS", metrics)
+    eb.collect_offline_detections(str(image))
+    assert set(metrics.scanner_duration) == {"scan_startup_folders", "scan_offline_profiles",
+                                             "scan_offline_services", "scan_scheduled_tasks"}
+    # the process placeholder is not a scanner failure; the missing Tasks folder is
+    assert list(metrics.scanner_errors) == [("scan_scheduled_tasks", "Scheduled tasks unavailable")]
+    assert "process_conflicts" not in metrics.findings
@@ -0,0 +1,201 @@
+import struct
+
+import pytest
+
+import ErrorBroker as eb
+
+
+class HiveBuilder:
+    # minimal regf writer: one hbin, cells appended in order, offsets relative to the first bin
+    def __init__(self):
+        self.bin = bytearray(b"hbin" + bytes(0x1C))
+
+    def cell(self, data: bytes) -> int:
+        off = len(self.bin)
+        size = (len(data) + 4 + 7) & ~7
+        self.bin += struct.pack("<i", -size) + data + bytes(size - 4 - len(data))
+        return off
+
+    def value(self, name: str, value_type: int, data: bytes) -> int:
+        if len(data) <= 4:
+            size, data_off = len(data) | 0x80000000, int.from_bytes(data.ljust(4, b"\0"), "little")
+        elif len(data) > 16344:
+            segments = [self.cell(data[i:i + 16344]) for i in range(0, len(data), 16344)]
+            seg_list = self.cell(b"".join(struct.pack("<I", s) for s in segments))
+            size, data_off = len(data), self.cell(b"db" + struct.pack("<HI", len(segments), seg_list))
+        else:
+            size, data_off = len(data), self.cell(data)
+        raw = name.encode("latin-1")
+        return self.cell(b"vk" + struct.pack("<HIIIHH", len(raw), size, data_off, value_type, 0x1, 0) + raw)
+
+    def subkey_list(self, kind: str, children) -> int:
+        if kind == "ri":
+            # split the children over an lh and an li leaf
+            half = len(children) // 2
+            leaves = [self.subkey_list("lh", children[:half]), self.subkey_list("li", children[half:])]
+            return self.cell(b"ri" + struct.pack("<H", len(leaves)) + b"".join(struct.pack("<I", o) for o in leaves))
+        if kind == "li":
+            entries = b"".join(struct.pack("<I", o) for o in children)
+        else:
+            entries = b"".join(struct.pack("<I4s", o, b"\0\0\0\0") for o in children)
+        return self.cell(kind.encode() + struct.pack("<H", len(children)) + entries)
+
+    def key(self, name: str, values=(), subkeys=(), kind: str = "lf", compressed: bool = True) -> int:
+        value_offs = [self.value(*v) for v in values]
+        value_list = self.cell(b"".join(struct.pack("<I", o) for o in value_offs)) if value_offs else 0xFFFFFFFF
+        sub_list = self.subkey_list(kind, list(subkeys)) if subkeys else 0xFFFFFFFF
+        raw = name.encode("latin-1") if compressed else name.encode("utf-16-le")
+        nk = bytearray(0x4C)
+        nk[0:2] = b"nk"
+        struct.pack_into("<H", nk, 2, 0x20 if compressed else 0)
+        struct.pack_into("<II", nk, 0x14, len(subkeys), 0)
+        struct.pack_into("<II", nk, 0x1C, sub_list, 0xFFFFFFFF)
+        struct.pack_into("<II", nk, 0x24, len(value_offs), value_list)
+        struct.pack_into("<H", nk, 0x48, len(raw))
+        return self.cell(bytes(nk) + raw)
+
+    def build(self, root: int) -> bytes:
+        struct.pack_into("<I", self.bin, 8, len(self.bin))
+        header = bytearray(eb.HIVE_BINS_OFFSET)
+        header[0:4] = b"regf"
+        struct.pack_into("<I", header, 0x24, root)
+        return bytes(header) + bytes(self.bin)
+
+
+def sz(text: str) -> bytes:
+    return (text + "\0").encode("utf-16-le")
+
+
+def dword(n: int) -> bytes:
+    return struct.pack("<I", n)
+
+
+def path_key(b: HiveBuilder, path: str, values=(), subkeys=()) -> int:
+    # nest a chain of keys ("A\B\C"), values and subkeys on the innermost one
+    *parents, leaf = path.split("\\")
+    nk = b.key(leaf, values, subkeys)
+    for name in reversed(parents):
+        nk = b.key(name, subkeys=[nk])
+    return nk
+
+
+def write_hive(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("kind", ["lf", "lh", "li", "ri"])
+def test_subkey_lists(tmp_path, kind):
+    b = HiveBuilder()
+    children = [b.key("Alpha"), b.key("Beta", compressed=False), b.key("Gamma"), b.key("Delta")]
+    path = write_hive(tmp_path / "hive", b.build(b.key("ROOT", subkeys=children, kind=kind)))
+    with eb.open_hive(path) as (buf, root):
+        assert [name for name, _ in eb.hive_subkeys(buf, root)] == ["Alpha", "Beta", "Gamma", "Delta"]
+        assert eb.hive_open_key(buf, root, "beta") is not None
+        assert eb.hive_open_key(buf, root, "Missing") is None
+
+
+def test_value_storage_and_types(tmp_path):
+    big = "C:\\Tools\\" + "x" * 20000 + ".exe"
+    b = HiveBuilder()
+    key = b.key("Run", values=[
+        ("Start", eb.REG_DWORD, dword(2)),                                  # inline in the vk offset field
+        ("Tiny", eb.REG_SZ, sz("a")),                                       # 4 bytes: still inline
+        ("ImagePath", eb.REG_EXPAND_SZ, sz("%SystemRoot%\\steam.exe")),    # separate data cell
+        ("Huge", eb.REG_SZ, sz(big)),                                       # db big-data record
+        ("Paths", eb.REG_MULTI_SZ, sz("one") + sz("two") + b"\0\0"),
+    ])
+    path = write_hive(tmp_path / "hive", b.build(b.key("ROOT", subkeys=[key])))
+    with eb.open_hive(path) as (buf, root):
+        values = eb.hive_values(buf, eb.hive_open_key(buf, root, "Run"))
+    assert values == {"Start": 2, "Tiny": "a", "ImagePath": "%SystemRoot%\\steam.exe", "Huge": big,
+                      "Paths": ["one", "two"]}
+
+
+def test_not_a_hive(tmp_path):
+    path = tmp_path / "NTUSER.DAT"
+    path.write_bytes(b"garbage" * 100)
+    with pytest.raises(ValueError):
+        with eb.open_hive(str(path)):
+            pass
+
+
+def system_hive(host: str = "WS-042") -> bytes:
+    # Select\Current points at ControlSet002; ControlSet001 is a stale copy that must be ignored
+    b = HiveBuilder()
+
+    def control_set(name, services, computer):
+        svc_keys = [b.key(svc, values=[("Type", eb.REG_DWORD, dword(0x10)), ("Start", eb.REG_DWORD, dword(start)),
+                                       ("DisplayName", eb.REG_SZ, sz(display)),
+                                       ("ImagePath", eb.REG_EXPAND_SZ, sz(image))])
+                    for svc, display, image, start in services]
+        svc_keys.append(b.key("disk", values=[("Type", eb.REG_DWORD, dword(0x1)),
+                                              ("ImagePath", eb.REG_EXPAND_SZ, sz("steam-ish.sys"))]))
+        computer_key = path_key(b, "Control\\ComputerName\\ComputerName",
+                                values=[("ComputerName", eb.REG_SZ, sz(computer))])
+        return b.key(name, subkeys=[b.key("Services", subkeys=svc_keys), computer_key])
+
+    old = control_set("ControlSet001", [("OldOverlay", "Overlay", "C:\\old\\overlay.exe", 2)], "STALE")
+    cur = control_set("ControlSet002", [("SteamService", "Steam Client Service", "C:\\Steam\\svc.exe", 3),
+                                        ("Spooler", "Print Spooler", "C:\\Windows\\spoolsv.exe", 2)], host)
+    select = b.key("Select", values=[("Current", eb.REG_DWORD, dword(2))])
+    return b.build(b.key("ROOT", subkeys=[old, cur, select]))
+
+
+def test_services_follow_select_current(tmp_path):
+    found = eb.scan_offline_services(write_hive(tmp_path / "SYSTEM", system_hive()))
+    assert [(f.name, f.display_name, f.state, f.path) for f in found] == [
+        ("SteamService", "Steam Client Service", "Manual", "C:\\Steam\\svc.exe")]
+
+
+def ntuser_hive(run_values) -> bytes:
+    b = HiveBuilder()
+    run = path_key(b, eb.HKCU_RUN_KEY, values=[(k, eb.REG_SZ, sz(v)) for k, v in run_values.items()])
+    return b.build(b.key("ROOT", subkeys=[run]))
+
+
+@pytest.fixture
+def image(tmp_path):
+    root = tmp_path / "image"
+    write_hive(root / "Windows" / "System32" / "config" / "SYSTEM", system_hive("IMAGED-PC"))
+    write_hive(root / "Users" / "alice" / "NTUSER.DAT",
+               ntuser_hive({"Discord": "C:\\Discord\\Update.exe", "OneDrive": "C:\\OneDrive.exe"}))
+    write_hive(root / "Users" / "bob" / "NTUSER.DAT", ntuser_hive({"Steam": "C:\\Steam\\steam.exe -silent"}))
+    (root / "Users" / "Public").mkdir()
+    return root
+
+
+def test_offline_detections_tag_each_profile(image):
+    detections = eb.collect_offline_detections(str(image))
+    assert detections["system"]["host"] == "IMAGED-PC"
+    hkcu = [f.to_dict() for f in detections["hkcu_conflicts"]]
+    assert hkcu == [{"name": "Discord", "value": "C:\\Discord\\Update.exe", "user": "alice"},
+                    {"name": "Steam", "value": "C:\\Steam\\steam.exe -silent", "user": "bob"}]
+    assert [f.name for f in detections["service_conflicts"]] == ["SteamService"]
+
+
+def test_corrupt_profile_hive_marks_section_partial(image):
+    (image / "Users" / "bob" / "NTUSER.DAT").write_bytes(b"\0" * 8192)
+    hkcu = eb.collect_offline_detections(str(image))["hkcu_conflicts"]
+    assert eb.is_partial(hkcu)
+    assert hkcu["details"].startswith("bob: ")
+    assert [(f.name, f.source) for f in hkcu["items"]] == [("Discord", "alice")]
+
+
+def test_offline_startup_reads_each_profile_runonce(image):
+    software = HiveBuilder()
+    run = path_key(software, "Microsoft\\Windows\\CurrentVersion\\Run",
+                   values=[("Discord", eb.REG_SZ, sz("C:\\Discord\\Update.exe"))])
+    write_hive(image / "Windows" / "System32" / "config" / "SOFTWARE",
+               software.build(software.key("ROOT", subkeys=[run])))
+    b = HiveBuilder()
+    run_once = path_key(b, "Software\\Microsoft\\Windows\\CurrentVersion\\RunOnce",
+                        values=[("SteamSetup", eb.REG_SZ, sz("C:\\Steam\\setup.exe /finish")),
+                                ("Cleanup", eb.REG_SZ, sz("C:\\Windows\\cleanup.exe"))])
+    write_hive(image / "Users" / "alice" / "NTUSER.DAT", b.build(b.key("ROOT", subkeys=[run_once])))
+
+    found = eb.collect_offline_detections(str(image))["startup_conflicts"]
+    assert [(f.source, f.name) for f in found] == [
+        ("HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Run", "Discord"),
+        ("alice: HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\RunOnce", "SteamSetup")]
@@ -0,0 +1,91 @@
+import struct
+
+import pytest
+
+import ErrorBroker as eb
+
+RSRC_RVA = 0x2000
+RSRC_RAW = 0x400
+
+
+def _pad4(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _vs_block(key: str, value: bytes = b"", text: bool = False, children=()) -> bytes:
+    value_len = len(value) // 2 if text else len(value)
+    body = _pad4(b"\0" * 6 + (key + "\0").encode("utf-16-le")) + value
+    for child in children:
+        body = _pad4(body) + child
+    return struct.pack("<HHH", len(body), value_len, 1 if text else 0) + body[6:]
+
+
+def version_info(product: str = "1.2.3.4", file: str = "5.6.7.8") -> bytes:
+    fixed = struct.pack("<13I", eb.VS_FIXEDFILEINFO_SIGNATURE, 0x10000, 0x00090008, 0x00070006,
+                        0x00040003, 0x00020001, 0, 0, 0, 0, 0, 0, 0)
+    strings = [_vs_block(k, (v + "\0").encode("utf-16-le"), text=True)
+               for k, v in (("CompanyName", "Fixture Corp"), ("FileVersion", file), ("ProductVersion", product))]
+    table = _vs_block("040904b0", children=strings)
+    return _vs_block("VS_VERSION_INFO", fixed, children=[_vs_block("StringFileInfo", children=[table])])
+
+
+def resource_section(blob: bytes) -> bytes:
+    # RT_VERSION -> name 1 -> language 0x409 -> data entry -> VS_VERSIONINFO
+    directory = b"".join([
+        struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1), struct.pack("<II", eb.RT_VERSION, 0x80000000 | 0x18),
+        struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1), struct.pack("<II", 1, 0x80000000 | 0x30),
+        struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1), struct.pack("<II", 0x409, 0x48),
+        struct.pack("<IIII", RSRC_RVA + 0x60, len(blob), 0, 0),
+    ])
+    return _pad4(directory.ljust(0x60, b"\0") + blob)
+
+
+def build_pe(pe32plus: bool = False, resources: bytes = None) -> bytes:
+    opt_size = 240 if pe32plus else 224
+    optional = bytearray(opt_size)
+    struct.pack_into("<H", optional, 0, 0x20B if pe32plus else 0x10B)
+    dirs = 112 if pe32plus else 96
+    struct.pack_into("<I", optional, dirs - 4, 16)
+    sections = b""
+    if resources is not None:
+        struct.pack_into("<II", optional, dirs + 2 * 8, RSRC_RVA, len(resources))
+        sections = b".rsrc\0\0\0" + struct.pack("<IIII", len(resources), RSRC_RVA, len(resources), RSRC_RAW) + b"\0" * 16
+    coff = struct.pack("<HHIIIHH", 0x8664 if pe32plus else 0x14C, 1 if sections else 0, 0, 0, 0, opt_size, 0x22)
+    headers = bytearray(0x80)
+    headers[0:2] = b"MZ"
+    struct.pack_into("<I", headers, 0x3C, 0x80)
+    image = bytes(headers) + b"PE\0\0" + coff + bytes(optional) + sections
+    if resources is None:
+        return image
+    return image.ljust(RSRC_RAW, b"\0") + resources
+
+
+@pytest.mark.parametrize("pe32plus", [False, True])
+def test_reads_version_strings(tmp_path, pe32plus):
+    exe = tmp_path / "app.exe"
+    exe.write_bytes(build_pe(pe32plus, resource_section(version_info("120.0.2210.91", "120.0.2210.91"))))
+    info = eb.read_pe_version_info(str(exe))
+    assert info["product_version"] == "120.0.2210.91"
+    assert info["file_version"] == "120.0.2210.91"
+    assert info["strings"]["CompanyName"] == "Fixture Corp"
+    assert info["fixed_file_version"] == "9.8.7.6"
+    assert info["fixed_product_version"] == "4.3.2.1"
+
+
+def test_no_resource_section(tmp_path):
+    exe = tmp_path / "bare.exe"
+    exe.write_bytes(build_pe())
+    assert eb.read_pe_version_info(str(exe)) == {"error": "no version resource"}
+
+
+@pytest.mark.parametrize("cut", [0x40, 0x100, RSRC_RAW + 0x20, RSRC_RAW + 0x70])
+def test_truncated_file(tmp_path, cut):
+    exe = tmp_path / "cut.exe"
+    exe.write_bytes(build_pe(resources=resource_section(version_info()))[:cut])
+    assert "error" in eb.read_pe_version_info(str(exe))
+
+
+def test_not_a_pe(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"just text, no MZ header")
+    assert "MZ" in eb.read_pe_version_info(str(path))["error"]
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+import pytest
+
+import ErrorBroker as eb
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake powershell is a POSIX shell script")
+
+FAKE_POWERSHELL = """#!/bin/sh
+echo "SteamService  Steam Client Service"
+sleep 60 &
+echo $! > "{pidfile}"
+sleep 60
+"""
+
+
+@pytest.fixture
+def hanging_powershell(monkeypatch, tmp_path):
+    pidfile = tmp_path / "grandchild.pid"
+    script = tmp_path / "powershell"
+    script.write_text(FAKE_POWERSHELL.format(pidfile=pidfile), encoding="utf-8")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setitem(sys.modules, "psutil", None)  # exercise the killpg path
+    return pidfile
+
+
+def is_alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            state = f.read().rsplit(")", 1)[1].split()[0]
+        return state not in ("Z", "X")
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+def wait_dead(pid, within=2.0):
+    end = time.monotonic() + within
+    while time.monotonic() < end:
+        if not is_alive(pid):
+            return True
+        time.sleep(0.05)
+    return not is_alive(pid)
+
+
+def test_timeout_returns_partial_output_within_budget(hanging_powershell):
+    start = time.monotonic()
+    out, err, rc = eb.powershell_exec("Get-Service", timeout=1.0)
+    elapsed = time.monotonic() - start
+    assert rc == eb.PS_TIMEOUT_RC
+    assert out == "SteamService  Steam Client Service"
+    assert elapsed < 1.5
+
+
+def test_timed_out_scanner_reports_salvaged_items(hanging_powershell):
+    start = time.monotonic()
+    result = eb.scan_windows_services(timeout=1.0)
+    assert time.monotonic() - start < 1.5
+    assert set(result) == {"error", "partial", "details", "items"}
+    assert (result["error"], result["partial"]) == ("timeout", True)
+    assert [f.to_dict() for f in result["items"]] == ["SteamService  Steam Client Service"]
+
+
+def test_grandchild_is_killed(hanging_powershell):
+    eb.powershell_exec("Get-Service", timeout=1.0)
+    pid = int(hanging_powershell.read_text().strip())
+    assert wait_dead(pid)
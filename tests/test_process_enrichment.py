@@ -0,0 +1,41 @@
+import threading
+
+import ErrorBroker as eb
+
+
+def test_hook_modules_skip_system_dlls(monkeypatch):
+    monkeypatch.setenv("SystemRoot", r"C:\WINDOWS")
+    paths = [
+        r"C:\Windows\System32\KBDUS.DLL",
+        r"C:\Windows\System32\kbdru.dll",
+        r"C:\Windows\System32\Windows.Graphics.Capture.dll",
+        r"C:\Windows\SysWOW64\kbdus.dll",
+        r"C:\Program Files\AutoHotkey\AutoHotkeyHook64.dll",
+        r"C:\Users\me\AppData\Local\Discord\app\discord_overlay.dll",
+        r"C:\Program Files\Tool\inject.exe",
+        None,
+    ]
+    assert eb.hook_modules(paths) == ["AutoHotkeyHook64.dll", "discord_overlay.dll"]
+
+
+def test_unreached_findings_are_marked_timeout(monkeypatch):
+    release = threading.Event()
+
+    def details(pid):
+        if pid == 1:
+            return {"ppid": 0}
+        release.wait(5)
+        return {"ppid": 0}
+
+    monkeypatch.setattr(eb, "process_details", details)
+    eb.start_replay(eb.ScanCapture())
+    try:
+        fast = eb.Finding("process_conflicts", name="fast", pid=1)
+        slow = eb.Finding("process_conflicts", name="slow", pid=2)
+        eb.enrich_processes([fast, slow], timeout=0.2)
+    finally:
+        release.set()
+        eb.stop_capture()
+    assert fast.extra == {"ppid": 0}
+    assert slow.extra == {"enrich_error": "timeout"}
+    assert slow.is_actionable()
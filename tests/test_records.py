@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import ErrorBroker as eb
+
+
+@pytest.mark.parametrize("finding, expected", [
+    (eb.Finding("process_conflicts", name="obs64.exe", pid=7, path="C:\\obs\\obs64.exe"),
+     {"name": "obs64.exe", "pid": 7, "path": "C:\\obs\\obs64.exe"}),
+    (eb.Finding("startup_conflicts", name="OBS", command="C:\\obs\\obs64.exe"),
+     {"name": "OBS", "command": "C:\\obs\\obs64.exe"}),
+    (eb.Finding("startup_conflicts", name="OBS", command="C:\\obs\\obs64.exe", source="C:\\StartUp"),
+     {"name": "OBS", "command": "C:\\obs\\obs64.exe", "source": "C:\\StartUp"}),
+    (eb.Finding("hkcu_conflicts", name="Discord", command="C:\\Discord\\Update.exe"),
+     {"name": "Discord", "value": "C:\\Discord\\Update.exe"}),
+    (eb.Finding("hkcu_conflicts", name="Discord", command="C:\\Discord\\Update.exe", source="alice"),
+     {"name": "Discord", "value": "C:\\Discord\\Update.exe", "user": "alice"}),
+    (eb.Finding("service_conflicts", name="SteamService", display_name="Steam Client Service",
+                state="Stopped", path="C:\\Steam\\svc.exe"),
+     {"name": "SteamService", "display_name": "Steam Client Service", "state": "Stopped", "path": "C:\\Steam\\svc.exe"}),
+    (eb.Finding("scheduled_task_conflicts", name="\\Discord", command="C:\\discord.exe", state="Enabled",
+                path="C:\\Windows\\System32\\Tasks\\Discord"),
+     {"name": "\\Discord", "command": "C:\\discord.exe", "state": "Enabled",
+      "path": "C:\\Windows\\System32\\Tasks\\Discord"}),
+    (eb.Finding("scheduled_task_conflicts", name="\\Bad", command="", state="Unknown", path="C:\\Tasks\\Bad",
+                extra={"error": "not well-formed"}),
+     {"name": "\\Bad", "command": "", "state": "Unknown", "path": "C:\\Tasks\\Bad", "error": "not well-formed"}),
+])
+def test_finding_shape_per_section(finding, expected):
+    assert finding.to_dict() == expected
+    assert list(finding.to_dict()) == list(expected)
+
+
+def test_source_is_ignored_where_the_section_has_no_key():
+    finding = eb.Finding("process_conflicts", name="obs64.exe", pid=7, path="", source="somewhere")
+    assert "source" not in finding.to_dict()
+
+
+@pytest.mark.parametrize("raw", ["SteamService  Steam Client Service",
+                                 {"error": "Services fetch failed", "details": "access denied"}])
+def test_raw_entries_are_emitted_verbatim(raw):
+    finding = eb.Finding("service_conflicts", raw=raw)
+    assert finding.to_dict() is raw
+    assert not finding.is_actionable()
+
+
+def test_action_omits_missing_result():
+    target = eb.Finding("process_conflicts", name="steam.exe", pid=42, path="C:\\Steam\\steam.exe")
+    assert eb.Action("kill", target).to_dict() == {"action": "kill", "target": target.to_dict()}
+    done = eb.Action("sc", {"name": "SteamService"}, {"ok": True})
+    assert done.to_dict() == {"action": "sc", "target": {"name": "SteamService"}, "result": {"ok": True}}
+
+
+def test_json_hook_matches_to_dict():
+    target = eb.Finding("hkcu_conflicts", name="Discord", command="x", source="alice")
+    report = {"hkcu_conflicts": [target], "actions": [eb.Action("delete", target, "ok")]}
+    assert json.loads(json.dumps(report, default=eb.to_jsonable)) == {
+        "hkcu_conflicts": [target.to_dict()],
+        "actions": [{"action": "delete", "target": target.to_dict(), "result": "ok"}]}
+    assert eb.to_plain(report) == json.loads(json.dumps(report, default=eb.to_jsonable))
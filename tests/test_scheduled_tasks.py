@@ -0,0 +1,47 @@
+import ErrorBroker as eb
+
+TASK_XML = """<?xml version="1.0" encoding="{encoding}"?>
+<Task xmlns="http://schemas.microsoft.com/windows/2004/02/mit/task">
+  <Settings><Enabled>true</Enabled></Settings>
+  <Actions><Exec><Command>C:\\Discord\\Update.exe</Command></Exec></Actions>
+</Task>
+"""
+
+
+def tasks_dir(tmp_path):
+    root = tmp_path / "Windows" / "System32" / "Tasks"
+    root.mkdir(parents=True)
+    return root
+
+
+def test_bad_task_files_do_not_abort_the_scan(tmp_path):
+    root = tasks_dir(tmp_path)
+    (root / "Discord Update").write_text(TASK_XML.format(encoding="utf-8"), encoding="utf-8")
+    (root / "Bogus Discord").write_text(TASK_XML.format(encoding="bogus"), encoding="utf-8")
+    (root / "Sjis Discord").write_bytes(TASK_XML.format(encoding="shift_jis").encode("shift_jis"))
+    (root / "Dangling Discord").symlink_to(tmp_path / "missing")
+
+    found = eb.scan_scheduled_tasks(image_root=str(tmp_path))
+
+    by_name = {f.name: f for f in found}
+    assert by_name["\\Discord Update"].command == "C:\\Discord\\Update.exe"
+    assert by_name["\\Discord Update"].is_actionable()
+    for name in ("\\Bogus Discord", "\\Sjis Discord", "\\Dangling Discord"):
+        assert by_name[name].error and not by_name[name].is_actionable()
+
+
+def test_worker_exception_becomes_error_finding(tmp_path, monkeypatch):
+    root = tasks_dir(tmp_path)
+    (root / "Steam").write_text(TASK_XML.format(encoding="utf-8"), encoding="utf-8")
+
+    def explode(source):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(eb, "parse_task_xml", explode)
+    found = eb.scan_scheduled_tasks(image_root=str(tmp_path))
+    assert [(f.name, f.error) for f in found] == [("\\Steam", "RuntimeError: boom")]
+
+
+def test_missing_tasks_root_is_an_error(tmp_path):
+    result = eb.scan_scheduled_tasks(image_root=str(tmp_path))
+    assert result["error"] == "Scheduled tasks unavailable"
@@ -0,0 +1,71 @@
+import struct
+
+import ErrorBroker as eb
+
+
+def build_lnk(target: str, arguments: str = "") -> bytes:
+    # ShellLinkHeader + LinkInfo (local base path) + Unicode COMMAND_LINE_ARGUMENTS
+    flags = eb.LNK_HAS_LINK_INFO | eb.LNK_IS_UNICODE | (eb.LNK_HAS_ARGUMENTS if arguments else 0)
+    header = bytearray(eb.LNK_HEADER_SIZE)
+    struct.pack_into("<I", header, 0, eb.LNK_HEADER_SIZE)
+    header[4:20] = bytes.fromhex("0114020000000000c000000000000046")
+    struct.pack_into("<I", header, 0x14, flags)
+    base = target.encode("latin-1") + b"\0"
+    base_off = 0x1C
+    suffix_off = base_off + len(base)
+    body = base + b"\0"
+    link_info = struct.pack("<7I", 0x1C + len(body), 0x1C, 0x1, 0, base_off, 0, suffix_off) + body
+    data = bytes(header) + link_info
+    if arguments:
+        data += struct.pack("<H", len(arguments)) + arguments.encode("utf-16-le")
+    return data
+
+
+def test_parse_lnk_target_and_arguments():
+    info = eb.parse_lnk(build_lnk(r"C:\Program Files\obs-studio\bin\64bit\obs64.exe", "--startreplaybuffer"))
+    assert info["target"] == r"C:\Program Files\obs-studio\bin\64bit\obs64.exe"
+    assert info["arguments"] == "--startreplaybuffer"
+
+
+def test_offline_startup_folder(tmp_path):
+    folder = tmp_path / "ProgramData" / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "StartUp"
+    folder.mkdir(parents=True)
+    (folder / "OBS Studio.lnk").write_bytes(build_lnk(r"C:\obs\obs64.exe", "--minimize-to-tray"))
+    (folder / "Notes.lnk").write_bytes(build_lnk(r"C:\Tools\notes.exe"))
+    (folder / "broken discord.lnk").write_bytes(b"\x4c\0\0\0")
+    (folder / "desktop.ini").write_bytes(b"[.ShellClassInfo]")
+
+    found = eb.scan_startup_folders(image_root=str(tmp_path))
+
+    by_name = {f.name: f for f in found}
+    assert set(by_name) == {"OBS Studio", "broken discord"}
+    assert by_name["OBS Studio"].command == r"C:\obs\obs64.exe --minimize-to-tray"
+    assert by_name["OBS Studio"].source == str(folder)
+    assert by_name["broken discord"].error
+
+
+def test_machine_run_keys_are_scanned():
+    hklm_run = r"HKLM\SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
+    wow_run = r"HKLM\SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run"
+    eb.start_replay(eb.ScanCapture({"registry": {
+        hklm_run: {"Discord": r"C:\Discord\Update.exe --processStart Discord.exe", "SecurityHealth": "x.exe"},
+        wow_run: {"SteamClient": r'"C:\Steam\steam.exe" -silent'},
+    }}))
+    try:
+        found = eb.scan_startup_folders()
+    finally:
+        eb.stop_capture()
+    assert [(f.source, f.name) for f in found] == [(hklm_run, "Discord"), (wow_run, "SteamClient")]
+
+
+def test_crashed_shortcut_keeps_its_display_name(tmp_path, monkeypatch):
+    folder = tmp_path / "ProgramData" / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "StartUp"
+    folder.mkdir(parents=True)
+    (folder / "Steam.lnk").write_bytes(build_lnk(r"C:\Steam\steam.exe"))
+
+    def explode(data):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(eb, "parse_lnk", explode)
+    found = eb.scan_startup_folders(image_root=str(tmp_path))
+    assert [(f.name, f.error) for f in found] == [("Steam", "RuntimeError: boom")]